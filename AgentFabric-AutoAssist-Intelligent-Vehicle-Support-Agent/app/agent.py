@@ -7,8 +7,15 @@ system prompts, guardrails, and the request lifecycle for vehicle support querie
 Key Features:
     - Domain-restricted system prompts (automotive only)
     - Safety guardrails (no financial/medical advice)
+    - Local pre-filter that refuses obviously off-topic queries without an LLM call
     - Input validation and sanitization
     - LLM adapter abstraction (swap models easily)
+    - Response cache (skip the LLM for repeated FAQs; fuzzy matching is opt-in)
+    - Optional background prefetch of common follow-up questions, per session
+    - Bounded LLM concurrency with an overall timeout per call
+    - Streaming responses (process_query_stream) for low time-to-first-token
+    - Bulk query processing (several queries per LLM call)
+    - Optional pre-tokenized system prompt for local llama.cpp servers
     - Comprehensive error handling
 
 Architecture:
@@ -20,10 +27,18 @@ Author: Babu Srinivasan
 Project: AgentFabric AutoAssist
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any
+import math
+import re
+import time
+import httpx
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 from app.config import AppConfig
-from app.llm_adapter import LLMAdapterFactory
+from app.llm_adapter import LLMAdapter, LLMAdapterFactory, Prompt
+from app.cache import SemanticCache, load_embedding_model, normalize_query
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +71,108 @@ Response Style:
 - Maintain a professional, helpful tone
 """
 
+# ============================================================================
+# GUARDRAIL PRE-FILTER
+# ============================================================================
+# Obviously off-topic (financial / medical) phrases are refused locally
+# before any LLM call. The patterns are single alternations of literal
+# phrases, so matching is linear in the query length and safe on
+# adversarial input. Keep phrases specific and unambiguous: "diagnose my
+# car", "symptoms of a bad alternator" or "seat belt when pregnant" are
+# valid automotive (safety) queries. A query that also mentions a vehicle
+# term is never refused here; the LLM's system prompt still applies.
+
+_OFF_TOPIC_PHRASES = (
+    # Financial
+    "stock price", "stock market", "stocks to buy", "share price",
+    "cryptocurrency", "bitcoin", "ethereum", "crypto wallet",
+    "investment advice", "investment portfolio", "retirement plan",
+    "401k", "mortgage rate", "tax return", "tax advice", "credit score",
+    # Medical
+    "heart attack", "blood pressure", "blood sugar", "my doctor",
+    "diagnose my rash",
+)
+_OFF_TOPIC_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(phrase) for phrase in _OFF_TOPIC_PHRASES) + r")\b",
+    re.IGNORECASE,
+)
+_VEHICLE_TERMS = (
+    "car", "cars", "vehicle", "vehicles", "truck", "suv", "van", "motorcycle",
+    "engine", "brake", "brakes", "tire", "tires", "tyre", "tyres", "wheel",
+    "seat belt", "seatbelt", "seat belts", "seatbelts", "airbag", "airbags",
+    "steering", "dashboard", "warning light", "transmission", "battery",
+    "drive", "driving", "driver", "braking", "passenger", "child seat", "car seat",
+)
+_VEHICLE_TERMS_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in _VEHICLE_TERMS) + r")\b",
+    re.IGNORECASE,
+)
+_OFF_TOPIC_REFUSAL = (
+    "I'm AutoAssist, an automotive support agent, so I can't help with financial "
+    "or medical questions. Please consult a qualified professional. I'm happy to "
+    "help with vehicle troubleshooting, maintenance, features, or warning indicators."
+)
+
+
+# Static prompt prefix/suffix, built once at import time.
+# Every request shares the exact same leading text, so providers with
+# prompt/KV caching (llama.cpp, LMStudio, OpenAI) can reuse the prefill
+# for the system prompt and only process the user query.
+_PROMPT_PREFIX = SYSTEM_PROMPT + "\n\nUser Query: "
+_PROMPT_SUFFIX = "\n\nProvide a helpful, safety-first response:"
+
+# Bulk prompt layout: queries are packed into numbered rows and the model
+# answers with a JSON array, so N queries share one request and one
+# prefill of the system prompt. Gains flatten out beyond ~8-16 rows.
+_BULK_PROMPT_PREFIX = (
+    SYSTEM_PROMPT
+    + "\n\nAnswer each user query below. Return ONLY a JSON array of strings, "
+    "one safety-first answer per query, in the same order.\n\n"
+)
+_BULK_PROMPT_SUFFIX = "\n\nJSON array:"
+MAX_QUERIES_PER_PROMPT = 8
+
+# Backoff between attempts to tokenize the prompt prefix after a failure
+# (doubles per failure, capped); text prompts are used in the meantime
+_TOKENIZE_RETRY_SECONDS = 5.0
+_TOKENIZE_RETRY_MAX_SECONDS = 300.0
+
+# Marks the end of a streamed LLM response in the chunk queue
+_STREAM_END = object()
+
+# Maximum accepted query length (prevents oversized prompts / DoS)
+MAX_QUERY_LENGTH = 1000
+
+# Follow-up questions pre-generated after a successful answer (when enabled):
+# (phrasings that ask it, question sent to the LLM). Answers are stored per
+# session and matched on the follow-up's own (normalised) wording, so they
+# only answer the next turn of the conversation that asked the original
+# question. The original question goes into the prompt, never into the key.
+_FOLLOWUPS = tuple(
+    (frozenset(normalize_query(phrasing) for phrasing in phrasings), question)
+    for phrasings, question in (
+        (
+            (
+                "How often should I do this?",
+                "How often should this be done?",
+                "How often do I need to do this?",
+                "How often?",
+            ),
+            "How often should this be done?",
+        ),
+        (
+            (
+                "What tools or parts do I need?",
+                "What tools do I need?",
+                "What parts do I need?",
+                "What do I need for this?",
+            ),
+            "What tools or parts do I need?",
+        ),
+    )
+)
+_FOLLOWUP_PROMPT = "{question} (Follow-up to my previous question: {query})"
+
 
 # ============================================================================
 # AGENT CLASS
@@ -71,14 +188,47 @@ class AutoAssistAgent:
     Attributes:
         config: Application configuration (LLM settings, timeouts, etc.)
         llm_adapter: Abstraction layer for LLM communication
+        response_cache: Cache of previous LLM responses (exact match unless an
+            embedding model is configured)
         logger: Logger instance for tracking agent operations
         
     Example:
         >>> agent = AutoAssistAgent(config)
         >>> result = await agent.process_query("What is tire pressure?")
         >>> print(result["response"])
+    
+    Performance:
+        Instance attributes live in __slots__ (fixed offsets, no per-instance
+        __dict__), and the adapter's bound submit method is cached as
+        _submit so the hot path skips the self.llm_adapter.submit lookup.
+    
+    Prompt-Prefix Caching:
+        With provider_family set (chat APIs), prompts are sent through
+        generate_with_prefix() with the static system prompt split off, so
+        the provider can cache it (Anthropic cache_control, OpenAI prefix
+        caching) and only the user query is new per request.
     """
     
+    __slots__ = (
+        "config",
+        "llm_adapter",
+        "response_cache",
+        "logger",
+        "_model_name",
+        "_submit",
+        "_pretokenize",
+        "_prefix_tokens",
+        "_prefix_lock",
+        "_tokenize_backoff",
+        "_tokenize_retry_at",
+        "_inflight",
+        "_call_timeout",
+        "_prefetch_enabled",
+        "_prefetch_slot",
+        "_prefetch_tasks",
+        "_followups",
+    )
+    
     def __init__(self, config: AppConfig):
         """
         Initialize the AutoAssist agent.
@@ -88,7 +238,133 @@ class AutoAssistAgent:
         """
         self.config = config
         self.llm_adapter = LLMAdapterFactory.create_adapter(config.llm)
+        # Bound method cached once for the per-request LLM call
+        self._submit = (
+            self._submit_with_prefix if config.llm.provider_family else self.llm_adapter.submit
+        )
+        # Cached once; read on every result instead of config.llm.model_name
+        self._model_name = config.llm.model_name
+        self.response_cache = SemanticCache(
+            max_entries=config.cache_max_entries,
+            threshold=config.cache_similarity_threshold,
+            ttl_seconds=config.cache_ttl_seconds,
+            # Exact match only unless an embedding model is configured
+            embedder=(
+                load_embedding_model(config.cache_embedding_model)
+                if config.cache_embedding_model
+                else None
+            ),
+        )
         self.logger = logging.getLogger(__name__)
+        # Token IDs of _PROMPT_PREFIX, fetched once on first use when
+        # pretokenize_prompt is enabled for a local backend
+        self._pretokenize = config.llm.pretokenize_prompt and config.llm.provider == "local"
+        self._prefix_tokens: Optional[List[int]] = None
+        # One tokenize call at a time; after a failure the next attempt
+        # waits until _tokenize_retry_at (event loop time)
+        self._prefix_lock = asyncio.Lock()
+        self._tokenize_backoff = 0.0
+        self._tokenize_retry_at = 0.0
+        # Bound in-flight LLM calls: bursts wait here instead of piling onto
+        # the backend and triggering timeout/retry storms
+        self._inflight = asyncio.Semaphore(config.llm.max_concurrency)
+        # Cap on one LLM call: room for every adapter attempt and its backoff,
+        # not just a single attempt's timeout_seconds
+        self._call_timeout = self.llm_adapter.call_budget_seconds()
+        # Follow-up prefetch runs one LLM call at a time so it never
+        # competes with user traffic for more than a single slot
+        self._prefetch_enabled = config.prefetch_followups
+        self._prefetch_slot = asyncio.Semaphore(1)
+        self._prefetch_tasks: set = set()
+        # session_id -> (normalised follow-up phrasing -> answer, expiry on the
+        # monotonic clock); one entry per session, oldest session evicted first
+        self._followups: "OrderedDict[str, Tuple[Dict[str, str], float]]" = OrderedDict()
+    
+    @staticmethod
+    def _validate_query(user_query: str) -> Optional[str]:
+        """
+        Validate a user query.
+        
+        Invalid input is an expected outcome, so it is reported as a return
+        value rather than an exception (no traceback construction).
+        
+        Args:
+            user_query: The user's vehicle support question
+        
+        Returns:
+            Optional[str]: Error message if the query is empty, not a
+            string, or too long; None if the query is valid
+        """
+        # Validate query is a string (exact type check, no MRO walk)
+        if type(user_query) is not str:
+            return "Invalid query: must be non-empty string"
+        
+        # Single length computation covers both bounds
+        length = len(user_query)
+        if length == 0:
+            return "Invalid query: must be non-empty string"
+        
+        # Enforce maximum length to prevent DoS attacks
+        if length > MAX_QUERY_LENGTH:
+            return "Query too long: maximum 1000 characters"
+        
+        return None
+    
+    @staticmethod
+    def is_off_topic(user_query: str) -> bool:
+        """
+        Check whether a query is obviously outside the automotive domain.
+        
+        Args:
+            user_query: The user's question
+        
+        Returns:
+            bool: True if the query matches a financial/medical guardrail
+            phrase and mentions no vehicle term
+        """
+        return (
+            _OFF_TOPIC_RE.search(user_query) is not None
+            and _VEHICLE_TERMS_RE.search(user_query) is None
+        )
+    
+    def _refusal_result(self, user_query: str) -> Dict[str, Any]:
+        """
+        Build the guardrail refusal for an off-topic query.
+        
+        Args:
+            user_query: The off-topic question
+        
+        Returns:
+            Dict[str, Any]: Success result carrying the canned refusal
+        """
+        self.logger.info("Off-topic query refused by guardrail pre-filter")
+        return {
+            "status": "success",
+            "query": user_query,
+            "response": _OFF_TOPIC_REFUSAL,
+            "model": self._model_name,
+            "cached": False,
+        }
+    
+    def _error_result(self, user_query: str, error: str) -> Dict[str, Any]:
+        """
+        Log a failed query and build its structured error response.
+        
+        Args:
+            user_query: The user's vehicle support question
+            error: Error message (server-side detail, sanitized by the API layer)
+        
+        Returns:
+            Dict[str, Any]: Error result in the process_query format
+        """
+        # Log error details for debugging (server-side only)
+        self.logger.error("Query processing failed: %s", error)
+        return {
+            "status": "error",
+            "query": user_query,
+            "error": error,
+            "model": self._model_name,
+        }
     
     def construct_prompt(self, user_query: str) -> str:
         """
@@ -107,25 +383,25 @@ class AutoAssistAgent:
             >>> prompt = agent.construct_prompt("How do I check oil?")
             >>> # Returns: SYSTEM_PROMPT + "\n\nUser Query: How do I check oil?\n\n..."
         """
-        return f"""{SYSTEM_PROMPT}
-
-User Query: {user_query}
-
-Provide a helpful, safety-first response:"""
+        # Single join: one allocation, no intermediate prefix+query string
+        return "".join((_PROMPT_PREFIX, user_query, _PROMPT_SUFFIX))
     
-    async def process_query(self, user_query: str) -> Dict[str, Any]:
+    async def process_query(self, user_query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Process user query through the agent pipeline.
         
         This is the main entry point for query processing. It handles:
-        1. Input validation
-        2. Prompt construction
-        3. LLM communication (with retry logic)
-        4. Response validation
-        5. Error handling
+        1. Input validation (including the off-topic guardrail pre-filter)
+        2. Cache lookup (this session's prefetched follow-ups, then the response cache)
+        3. Prompt construction
+        4. LLM communication (with retry logic)
+        5. Response validation
+        6. Error handling
         
         Args:
             user_query: User's vehicle support question (1-1000 chars)
+            session_id: Conversation the query belongs to; enables follow-up
+                prefetch (PREFETCH_FOLLOWUPS) for its next turn
             
         Returns:
             Dict containing:
@@ -134,75 +410,536 @@ Provide a helpful, safety-first response:"""
                 - response: LLM-generated response (if successful)
                 - error: Error message (if failed)
                 - model: LLM model name used
+                - cached: True if the response was served from the cache
                 
-        Raises:
-            ValueError: If query is invalid (empty, too long, wrong type)
-            RuntimeError: If LLM communication fails after retries
+        Error Handling:
+            Invalid queries, LLM failures (after adapter retries) and empty
+            LLM responses are returned as status "error" results rather
+            than raised. Only the LLM call itself is wrapped in try/except.
             
         Example:
             >>> result = await agent.process_query("What is tire pressure?")
             >>> if result["status"] == "success":
             ...     print(result["response"])
         """
-        try:
-            # ================================================================
-            # STEP 1: INPUT VALIDATION
-            # ================================================================
-            # Validate query is non-empty string
-            if not user_query or not isinstance(user_query, str):
-                raise ValueError("Invalid query: must be non-empty string")
-            
-            # Enforce maximum length to prevent DoS attacks
-            if len(user_query) > 1000:
-                raise ValueError("Query too long: maximum 1000 characters")
-            
-            # ================================================================
-            # STEP 2: PROMPT CONSTRUCTION
-            # ================================================================
-            # Combine system prompt with user query
-            full_prompt = self.construct_prompt(user_query)
-            
-            # ================================================================
-            # STEP 3: LLM GENERATION
-            # ================================================================
-            # Send to LLM (includes automatic retry logic in adapter)
-            self.logger.info(f"Processing query: {user_query[:100]}...")
-            response_text = await self.llm_adapter.generate(full_prompt)
-            
-            # ================================================================
-            # STEP 4: RESPONSE VALIDATION
-            # ================================================================
-            # Ensure LLM returned a non-empty response
-            if not response_text:
-                raise RuntimeError("Empty response from LLM")
-            
-            # ================================================================
-            # STEP 5: STRUCTURE RESPONSE
-            # ================================================================
-            # Return structured response for API
-            result = {
+        # ================================================================
+        # STEP 1: INPUT VALIDATION
+        # ================================================================
+        error = self._validate_query(user_query)
+        if error is not None:
+            return self._error_result(user_query, error)
+        
+        # Guardrail pre-filter: refuse obviously off-topic queries locally
+        if self.is_off_topic(user_query):
+            return self._refusal_result(user_query)
+        
+        # ================================================================
+        # STEP 2: RESPONSE CACHE LOOKUP
+        # ================================================================
+        # Repeated FAQs are answered without an LLM round-trip
+        cached_response = self._cache_lookup(user_query, session_id)
+        if cached_response is not None:
+            return {
                 "status": "success",
                 "query": user_query,
-                "response": response_text,
-                "model": self.config.llm.model_name,
+                "response": cached_response,
+                "model": self._model_name,
+                "cached": True,
             }
+        
+        return await self._answer_uncached(user_query, session_id)
+    
+    async def _answer_uncached(self, user_query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Answer a validated query that missed the cache (steps 3-6 of process_query).
+        
+        Args:
+            user_query: Vehicle support question, already validated and looked up
+            session_id: Conversation the query belongs to (for follow-up prefetch)
+        
+        Returns:
+            Dict[str, Any]: Result dict, as returned by process_query()
+        """
+        # ================================================================
+        # STEP 3: PROMPT CONSTRUCTION
+        # ================================================================
+        # Combine system prompt with user query
+        full_prompt = await self._build_prompt(user_query)
+        
+        # ================================================================
+        # STEP 4: LLM GENERATION
+        # ================================================================
+        # Send to LLM (includes automatic retry logic in adapter)
+        # submit() coalesces concurrent queries when batching is enabled
+        # Lazy %-formatting: the 100-char truncation only happens if INFO is enabled
+        self.logger.info("Processing query: %.100s...", user_query)
+        try:
+            response_text = await self._call_llm(full_prompt)
+        except (httpx.HTTPError, RuntimeError, asyncio.TimeoutError) as e:
+            return self._error_result(user_query, str(e))
+        
+        # ================================================================
+        # STEP 5: RESPONSE VALIDATION
+        # ================================================================
+        # Ensure LLM returned a non-empty response
+        if not response_text:
+            return self._error_result(user_query, "Empty response from LLM")
+        
+        # Remember the response for future near-duplicate queries
+        self.response_cache.put(user_query, response_text)
+        
+        # Answer this session's likely follow-ups outside the request path
+        self._start_prefetch(user_query, session_id)
+        
+        # ================================================================
+        # STEP 6: STRUCTURE RESPONSE
+        # ================================================================
+        # Return structured response for API
+        return {
+            "status": "success",
+            "query": user_query,
+            "response": response_text,
+            "model": self._model_name,
+            "cached": False,
+        }
+    
+    async def process_query_stream(self, user_query: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Process a user query, yielding the response in chunks as it's generated.
+        
+        Runs the same pipeline as process_query (validation, guardrail
+        pre-filter, cache lookup, prompt construction) but streams the LLM
+        output, so the caller sees the first text after the model's first
+        decode step rather than after the full generation. Guardrail
+        refusals and cache hits are yielded as a single chunk.
+        
+        The full text is accumulated so it can be validated and cached once
+        the stream completes.
+        
+        The LLM stream is read by a background task into a queue, so the
+        concurrency slot is held only while the backend generates - a
+        slow-reading client delays its own chunks, not other requests.
+        The first chunk must arrive within the LLM timeout_seconds, and the
+        whole generation within REQUEST_TIMEOUT_SECONDS (if set).
+        
+        Args:
+            user_query: User's vehicle support question (1-1000 chars)
+            session_id: Conversation the query belongs to (see process_query)
+        
+        Yields:
+            str: Response text chunks
+        
+        Raises:
+            ValueError: If the query is invalid (raised before the first chunk)
+            RuntimeError: If the LLM returns an empty response
+            asyncio.TimeoutError: If the first chunk or the full response is too slow
+            httpx.HTTPError: If the LLM request fails
+        
+        Example:
+            >>> async for chunk in agent.process_query_stream("How do I jump-start?"):
+            ...     print(chunk, end="")
+        """
+        error = self._validate_query(user_query)
+        if error is not None:
+            self.logger.error("Query processing failed: %s", error)
+            raise ValueError(error)
+        
+        if self.is_off_topic(user_query):
+            self.logger.info("Off-topic query refused by guardrail pre-filter")
+            yield _OFF_TOPIC_REFUSAL
+            return
+        
+        cached_response = self._cache_lookup(user_query, session_id)
+        if cached_response is not None:
+            yield cached_response
+            return
+        
+        full_prompt = await self._build_prompt(user_query)
+        self.logger.info("Streaming query: %.100s...", user_query)
+        
+        chunks: List[str] = []
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._read_stream(full_prompt, queue))
+        try:
+            # Time to first chunk (includes waiting for a concurrency slot)
+            item = await asyncio.wait_for(queue.get(), self.config.llm.timeout_seconds)
+            while item is not _STREAM_END:
+                if isinstance(item, BaseException):
+                    raise item
+                chunks.append(item)
+                yield item
+                item = await queue.get()
+        finally:
+            # Client went away or the stream failed - stop the backend request
+            producer.cancel()
+        
+        response_text = "".join(chunks).strip()
+        if not response_text:
+            self.logger.error("Query processing failed: %s", "Empty response from LLM")
+            raise RuntimeError("Empty response from LLM")
+        self.response_cache.put(user_query, response_text)
+        self._start_prefetch(user_query, session_id)
+    
+    async def _read_stream(self, prompt: Prompt, queue: asyncio.Queue) -> None:
+        """
+        Read an LLM stream into a queue under the concurrency limit.
+        
+        Puts each text chunk, then _STREAM_END - or the exception that
+        ended the stream. The whole generation is capped at
+        REQUEST_TIMEOUT_SECONDS (0 = no cap).
+        
+        Args:
+            prompt: Prompt to send
+            queue: Queue the consumer reads chunks from
+        """
+        try:
+            async with self._inflight:
+                async with asyncio.timeout(self.config.request_timeout_seconds or None):
+                    async for chunk in self.llm_adapter.generate_stream(prompt):
+                        queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(e)
+        else:
+            queue.put_nowait(_STREAM_END)
+    
+    def _cache_lookup(self, user_query: str, session_id: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached answer: the session's prefetched follow-ups, then the response cache.
+        
+        Follow-ups come first: "How often should I do this?" means something
+        different in every conversation, so a session's own answer beats a
+        context-free one from the shared cache.
+        
+        Args:
+            user_query: The user's vehicle support question
+            session_id: Conversation the query belongs to (None = no follow-ups)
+        
+        Returns:
+            Optional[str]: Cached response, or None on a miss
+        """
+        if session_id is not None and self._followups:
+            entry = self._followups.get(session_id)
+            if entry is not None:
+                answers, expires_at = entry
+                if expires_at <= time.monotonic():
+                    del self._followups[session_id]
+                else:
+                    answer = answers.get(normalize_query(user_query))
+                    if answer is not None:
+                        return answer
+        return self.response_cache.get(user_query)
+    
+    async def _build_prompt(self, user_query: str) -> Prompt:
+        """
+        Build the LLM prompt for a query (pre-tokenized prefix if enabled).
+        
+        Args:
+            user_query: The user's vehicle support question
+        
+        Returns:
+            Prompt: Text prompt, or mixed token/text prompt when pretokenizing
+        """
+        if self._pretokenize:
+            return await self.construct_prompt_tokens(user_query)
+        return self.construct_prompt(user_query)
+    
+    async def _call_llm(self, prompt: Prompt) -> str:
+        """
+        Send a prompt to the LLM under the concurrency limit.
+        
+        At most max_concurrency calls run at once. The call, including the
+        adapter's retries and backoff, is capped at the adapter's
+        call_budget_seconds() (~3 x timeout_seconds + backoff), so a first
+        attempt that times out still leaves time for the retries. The
+        end-to-end /chat limit (REQUEST_TIMEOUT_SECONDS) wraps this and also
+        covers queueing for a concurrency slot.
+        
+        Args:
+            prompt: Prompt to send
+        
+        Returns:
+            str: Generated response text
+        
+        Raises:
+            RuntimeError: If the adapter fails after retries or the call
+                exceeds its retry budget
+        """
+        timeout = self._call_timeout
+        async with self._inflight:
+            try:
+                return await asyncio.wait_for(self._submit(prompt), timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"LLM call timed out after {timeout:.1f}s") from None
+    
+    async def _submit_with_prefix(self, prompt: Prompt) -> str:
+        """
+        Send a prompt with its static prefix split off for provider caching.
+        
+        Args:
+            prompt: Prompt built by construct_prompt() or construct_bulk_prompt()
+        
+        Returns:
+            str: Generated response text
+        """
+        if isinstance(prompt, str):
+            for prefix in (_PROMPT_PREFIX, _BULK_PROMPT_PREFIX):
+                if prompt.startswith(prefix):
+                    return await self.llm_adapter.generate_with_prefix(prefix, prompt[len(prefix):])
+        return await self.llm_adapter.submit(prompt)
+    
+    def _start_prefetch(self, user_query: str, session_id: Optional[str]) -> None:
+        """
+        Start pre-generating this session's follow-up answers in the background.
+        
+        Replaces the session's previous follow-ups: "this" now refers to the
+        new question. A no-op without a session_id or with prefetch disabled.
+        
+        Args:
+            user_query: The query that was just answered
+            session_id: Conversation the query belongs to
+        """
+        if not self._prefetch_enabled or session_id is None:
+            return
+        
+        answers: Dict[str, str] = {}
+        ttl = self.config.cache_ttl_seconds
+        self._followups[session_id] = (answers, time.monotonic() + ttl if ttl > 0 else math.inf)
+        self._followups.move_to_end(session_id)
+        while len(self._followups) > max(self.config.cache_max_entries, 1):
+            self._followups.popitem(last=False)
+        
+        task = asyncio.create_task(self._prefetch_followups(user_query, answers))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+    
+    async def _prefetch_followups(self, user_query: str, answers: Dict[str, str]) -> None:
+        """
+        Pre-generate answers to common follow-up questions.
+        
+        Runs as a background task after a successful answer. Each answer is
+        stored under every phrasing of its follow-up, so the session's next
+        turn ("How often should I do this?") is served at cache-hit latency.
+        Failures are logged and otherwise ignored.
+        
+        Args:
+            user_query: The query that was just answered (context for the prompts)
+            answers: The session's follow-up store to fill
+        """
+        for phrasings, question in _FOLLOWUPS:
+            prompt = await self._build_prompt(_FOLLOWUP_PROMPT.format(question=question, query=user_query))
+            async with self._prefetch_slot:
+                try:
+                    response_text = await self._call_llm(prompt)
+                except (httpx.HTTPError, RuntimeError, asyncio.TimeoutError) as e:
+                    self.logger.warning("Follow-up prefetch failed: %s", e)
+                    return
+            if response_text:
+                answers.update(dict.fromkeys(phrasings, response_text))
+    
+    async def construct_prompt_tokens(self, user_query: str) -> Prompt:
+        """
+        Construct the prompt with the static prefix as pre-computed token IDs.
+        
+        The system prompt prefix is tokenized once via the backend and reused,
+        so the server skips re-tokenizing it and can match its prompt cache
+        on the exact token sequence. The user query is appended as text in
+        the same request (llama.cpp accepts mixed token/text prompts), which
+        avoids an extra tokenize round-trip per query.
+        
+        Falls back to the plain text prompt if the backend can't tokenize,
+        and tries again after a backoff (5s, doubling up to 5 minutes).
+        Concurrent first requests share a single tokenize call.
+        
+        Args:
+            user_query: The user's vehicle support question
+            
+        Returns:
+            Prompt: [*prefix_token_ids, "<query + suffix>"] or the text prompt
+        """
+        prefix_tokens = self._prefix_tokens
+        if prefix_tokens is None:
+            prefix_tokens = await self._tokenize_prefix()
+            if prefix_tokens is None:
+                return self.construct_prompt(user_query)
+        return [*prefix_tokens, "".join((user_query, _PROMPT_SUFFIX))]
+    
+    async def _tokenize_prefix(self) -> Optional[List[int]]:
+        """
+        Tokenize _PROMPT_PREFIX via the backend, unless backing off.
+        
+        Returns:
+            Optional[List[int]]: Prefix token IDs, or None if unavailable for now
+        """
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._tokenize_retry_at:
+            return None
+        async with self._prefix_lock:
+            # Another request may have tokenized (or failed) while this one waited
+            if self._prefix_tokens is None and loop.time() >= self._tokenize_retry_at:
+                try:
+                    self._prefix_tokens = await self.llm_adapter.tokenize(_PROMPT_PREFIX)
+                except Exception as e:
+                    self._tokenize_backoff = min(
+                        self._tokenize_backoff * 2 or _TOKENIZE_RETRY_SECONDS,
+                        _TOKENIZE_RETRY_MAX_SECONDS,
+                    )
+                    self._tokenize_retry_at = loop.time() + self._tokenize_backoff
+                    self.logger.warning(
+                        "Prompt pre-tokenization failed, using text prompts for %.0fs: %s",
+                        self._tokenize_backoff, e,
+                    )
+        return self._prefix_tokens
+    
+    def construct_bulk_prompt(self, user_queries: List[str]) -> str:
+        """
+        Construct a single prompt that asks for answers to several queries.
+        
+        Args:
+            user_queries: Vehicle support questions (at most MAX_QUERIES_PER_PROMPT)
+        
+        Returns:
+            str: Prompt with the queries as numbered rows
+        
+        Example:
+            >>> prompt = agent.construct_bulk_prompt(["Check oil?", "Tire PSI?"])
+            >>> # Returns: ... "1. Check oil?\n2. Tire PSI?\n\nJSON array:"
+        """
+        rows = "\n".join(f"{i}. {query}" for i, query in enumerate(user_queries, 1))
+        return "".join((_BULK_PROMPT_PREFIX, rows, _BULK_PROMPT_SUFFIX))
+    
+    @staticmethod
+    def _parse_bulk_response(response_text: str, expected: int) -> Optional[List[str]]:
+        """
+        Parse the JSON array returned for a bulk prompt.
+        
+        Tolerates text around the array (e.g. markdown fences).
+        
+        Args:
+            response_text: Raw LLM response
+            expected: Number of answers expected
+        
+        Returns:
+            Optional[List[str]]: Answers in order, or None if the response
+            is not a JSON array of exactly `expected` non-empty strings
+        """
+        start = response_text.find("[")
+        end = response_text.rfind("]")
+        if start == -1 or end < start:
+            return None
+        try:
+            answers = json.loads(response_text[start:end + 1])
+        except ValueError:
+            return None
+        if (
+            not isinstance(answers, list)
+            or len(answers) != expected
+            or not all(isinstance(answer, str) and answer.strip() for answer in answers)
+        ):
+            return None
+        return [answer.strip() for answer in answers]
+    
+    async def process_queries(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several user queries with as few LLM calls as possible.
+        
+        Queries are validated and checked against the response cache
+        individually; the remaining ones are packed MAX_QUERIES_PER_PROMPT
+        at a time into a single prompt. Single-query chunks, and chunks whose
+        answer can't be parsed, are sent one query per LLM call.
+        
+        Args:
+            user_queries: Vehicle support questions
+        
+        Returns:
+            List of result dicts (same shape as process_query), one per
+            query, in input order
+        
+        Example:
+            >>> results = await agent.process_queries(["P0420 meaning?", "P0171 meaning?"])
+            >>> [r["status"] for r in results]
+            ['success', 'success']
+        """
+        model_name = self._model_name
+        results: List[Optional[Dict[str, Any]]] = [None] * len(user_queries)
+        pending: List[int] = []
+        
+        # Step 1: Validate and serve cache hits per query
+        for i, user_query in enumerate(user_queries):
+            error = self._validate_query(user_query)
+            if error is not None:
+                results[i] = self._error_result(user_query, error)
+                continue
+            if self.is_off_topic(user_query):
+                results[i] = self._refusal_result(user_query)
+                continue
+            cached_response = self._cache_lookup(user_query)
+            if cached_response is not None:
+                results[i] = {
+                    "status": "success",
+                    "query": user_query,
+                    "response": cached_response,
+                    "model": model_name,
+                    "cached": True,
+                }
+            else:
+                pending.append(i)
+        
+        # Step 2: Answer remaining queries in chunks, one LLM call per chunk
+        for offset in range(0, len(pending), MAX_QUERIES_PER_PROMPT):
+            chunk = pending[offset:offset + MAX_QUERIES_PER_PROMPT]
+            chunk_queries = [user_queries[i] for i in chunk]
             
-            return result
+            answers = None
+            if len(chunk) > 1:
+                try:
+                    self.logger.info("Processing bulk query chunk of %d", len(chunk))
+                    response_text = await self._call_llm(self.construct_bulk_prompt(chunk_queries))
+                    answers = self._parse_bulk_response(response_text, len(chunk))
+                except (httpx.HTTPError, RuntimeError, asyncio.TimeoutError) as e:
+                    self.logger.error("Bulk query processing failed: %s", e)
+                if answers is None:
+                    self.logger.warning("Bulk response unusable, falling back to per-query processing")
             
-        except Exception as e:
-            # ================================================================
-            # ERROR HANDLING
-            # ================================================================
-            # Log error details for debugging (server-side only)
-            self.logger.error(f"Query processing failed: {str(e)}")
+            if answers is None:
+                # Already validated and looked up in Step 1 - go straight to the LLM
+                for i in chunk:
+                    results[i] = await self._answer_uncached(user_queries[i])
+                continue
             
-            # Return structured error response
-            return {
-                "status": "error",
-                "query": user_query,
-                "error": str(e),
-                "model": self.config.llm.model_name,
-            }
+            for i, answer in zip(chunk, answers):
+                self.response_cache.put(user_queries[i], answer)
+                results[i] = {
+                    "status": "success",
+                    "query": user_queries[i],
+                    "response": answer,
+                    "model": model_name,
+                    "cached": False,
+                }
+        
+        return results
+    
+    async def aclose(self) -> None:
+        """
+        Release the agent's LLM connections.
+        
+        Cancels pending follow-up prefetches (and waits for them to finish,
+        so none is still using a client) and closes the shared HTTP
+        clients. Call on application shutdown.
+        """
+        tasks = list(self._prefetch_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.llm_adapter.aclose()
+        await LLMAdapter.aclose_clients()
+    
+    async def warmup(self) -> None:
+        """
+        Pre-open the LLM connection so the first query skips the handshake.
+        
+        Call on application startup, after validate_config().
+        """
+        await self.llm_adapter.warmup()
     
     def validate_config(self) -> bool:
         """
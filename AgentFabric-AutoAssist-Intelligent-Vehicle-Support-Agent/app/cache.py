@@ -0,0 +1,269 @@
+"""
+Response Cache - Caching for Repeated Vehicle Queries
+=====================================================
+
+This module implements a lightweight response cache that sits in front of the
+LLM. Vehicle owners ask the same FAQs over and over ("what tire pressure
+should I use?", "how do I check my oil?"), and each of those would otherwise
+cost a full LLM generation.
+
+Architecture:
+    - normalize_query(): Casing/punctuation/whitespace-insensitive cache key
+    - load_embedding_model(): Optional sentence-transformers embedder
+    - SemanticCache: Bounded cache with an exact-match lookup and, only when
+      an embedding model is configured, a cosine-similarity fallback
+
+Lookup Strategy:
+    1. Exact match on the normalised query (dict lookup, O(1)) - the default
+    2. Only with an embedder: cosine similarity of the query embedding
+       against every cached embedding (one matrix-vector product)
+    3. Hit if best similarity >= threshold (default: 0.92)
+    Entries older than ttl_seconds (if set) are dropped before each lookup.
+
+Why Exact Match By Default?
+    - A wrong cached answer is served at cache-hit speed with full
+      confidence. For a safety-first assistant that is worse than a miss.
+    - Word-overlap similarity can't tell "5W-30 instead of 10W-40" from
+      "10W-40 instead of 5W-30", cold start from hot start, or an oil
+      warning light from a brake warning light.
+    - Normalisation still folds casing, punctuation and spacing, which is
+      where most repeated FAQs differ.
+    Fuzzy matching is opt-in (CACHE_EMBEDDING_MODEL) and uses a real
+    sentence-embedding model. Even then, keep the threshold high: two
+    questions that differ only in a part number can still embed closely.
+
+Usage Example:
+    ```python
+    cache = SemanticCache(max_entries=256)
+    cached = cache.get("What is the tire pressure?")
+    if cached is None:
+        response = await llm.generate(prompt)
+        cache.put("What is the tire pressure?", response)
+    ```
+
+Production Notes:
+    - Cache is in-memory and per-process (resets on restart)
+    - Oldest entries are evicted first once max_entries is reached
+    - Optional TTL bounds how stale a cached answer can get
+    - Keyed by user query, not full prompt: every prompt shares the long
+      system prompt, which would swamp prompt-level similarity
+    - With an embedder, each lookup/put runs a model forward pass on the
+      calling thread (milliseconds on CPU)
+    - For multi-worker deployments, consider a shared cache (Redis)
+
+Author: AutoAssist Development Team
+License: MIT
+"""
+
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+# Tokens are runs of word characters; punctuation and whitespace are dropped
+_TOKEN_RE = re.compile(r"\w+")
+
+# Query text -> unit-norm embedding vector (a numpy array)
+Embedder = Callable[[str], Any]
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalise a query for exact-match caching.
+
+    Lowercases the query and collapses punctuation/whitespace so that
+    "What is tire pressure?" and "what is  tire pressure" share a key.
+    Word order is kept, so "5W-30 instead of 10W-40" and "10W-40 instead
+    of 5W-30" get different keys.
+
+    Args:
+        query (str): Raw user query
+
+    Returns:
+        str: Normalised query (space-separated lowercase tokens)
+    """
+    return " ".join(_TOKEN_RE.findall(query.lower()))
+
+
+def load_embedding_model(model_name: str) -> Embedder:
+    """
+    Load a sentence-transformers model for semantic cache matching.
+
+    Args:
+        model_name (str): Model name or path, e.g. "all-MiniLM-L6-v2"
+
+    Returns:
+        Embedder: Function mapping a query to its unit-norm embedding
+
+    Raises:
+        RuntimeError: If sentence-transformers is not installed
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise RuntimeError(
+            "CACHE_EMBEDDING_MODEL requires the sentence-transformers package "
+            "(pip install sentence-transformers)"
+        ) from e
+
+    model = SentenceTransformer(model_name)
+    return lambda query: model.encode(query, normalize_embeddings=True)
+
+
+class SemanticCache:
+    """
+    Bounded Response Cache with Optional Semantic Matching
+
+    Stores LLM responses keyed by normalised query. Without an embedder
+    only exact (normalised) repeats are hits. With an embedder, the query
+    embedding is also stored and near-duplicate queries can hit.
+
+    Attributes:
+        max_entries (int): Maximum cached responses before eviction
+        threshold (float): Minimum cosine similarity for a semantic hit (0.0-1.0)
+        ttl_seconds (float): Entry lifetime in seconds (0 = never expire)
+        embedder (Optional[Embedder]): Embedding function; None = exact match only
+        hits (int): Number of cache hits served
+        misses (int): Number of lookups that fell through to the LLM
+
+    Eviction:
+        Oldest-written entry is evicted first (FIFO). A hit does not
+        refresh an entry's position; re-putting a query does. Because all
+        entries share one TTL, write order is also expiry order, so expired
+        entries are always at the front and are purged cheaply on lookup.
+
+    Similarity Search:
+        Embeddings are unit-norm, so the cosine similarity of the query to
+        every entry is one product of the stacked entry matrix with the
+        query vector. The matrix is rebuilt lazily after the entries change.
+
+    Example:
+        ```python
+        cache = SemanticCache(max_entries=2)
+        cache.put("check oil level", "Pull the dipstick...")
+        cache.get("Check oil level!")         # exact hit (same normalised key)
+        cache.get("How do I check the oil?")  # miss without an embedder
+        ```
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        threshold: float = 0.92,
+        ttl_seconds: float = 0,
+        embedder: Optional[Embedder] = None,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached responses (0 disables caching)
+            threshold (float): Cosine similarity required for a semantic hit
+            ttl_seconds (float): Seconds before an entry expires (0 = never)
+            embedder (Optional[Embedder]): Enables semantic matching (see load_embedding_model())
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.embedder = embedder
+        self.hits = 0
+        self.misses = 0
+        # normalised query -> (embedding or None, response, expiry time on the monotonic clock)
+        self._entries: "OrderedDict[str, Tuple[Any, str, float]]" = OrderedDict()
+        # (keys, stacked embeddings) for similarity search; None = stale
+        self._matrix: Optional[Tuple[list, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, query: str) -> Optional[str]:
+        """
+        Look up a cached response for the query.
+
+        Args:
+            query (str): User query
+
+        Returns:
+            Optional[str]: Cached response, or None on a miss
+        """
+        if self.max_entries <= 0:
+            return None
+
+        if self.ttl_seconds > 0:
+            self._purge_expired()
+
+        key = normalize_query(query)
+
+        # Step 1: Exact match on the normalised query
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        # Step 2: Semantic match (only with an embedding model)
+        if self.embedder is not None and self._entries:
+            keys, matrix = self._similarity_matrix()
+            scores = matrix @ self.embedder(query)
+            best = int(scores.argmax())
+            # Step 3: Only accept sufficiently similar matches
+            if scores[best] >= self.threshold:
+                self.hits += 1
+                return self._entries[keys[best]][1]
+
+        self.misses += 1
+        return None
+
+    def put(self, query: str, response: str) -> None:
+        """
+        Store a response for the query, evicting the oldest entry if full.
+
+        Args:
+            query (str): User query the response was generated for
+            response (str): LLM-generated response text
+        """
+        if self.max_entries <= 0:
+            return
+
+        key = normalize_query(query)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else math.inf
+        existing = self._entries.get(key)
+        if existing is not None:
+            # Same key means same embedding - only the response and expiry change
+            self._entries[key] = (existing[0], response, expires_at)
+            self._entries.move_to_end(key)
+            return
+
+        embedding = self.embedder(query) if self.embedder is not None else None
+        self._entries[key] = (embedding, response, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._matrix = None
+
+    def _similarity_matrix(self) -> Tuple[list, Any]:
+        """Return (keys, embeddings stacked row-wise), rebuilding it if stale."""
+        if self._matrix is None:
+            import numpy  # Installed with sentence-transformers
+
+            keys = list(self._entries)
+            self._matrix = (keys, numpy.stack([self._entries[key][0] for key in keys]))
+        return self._matrix
+
+    def _purge_expired(self) -> None:
+        """Evict expired entries (always the oldest-written ones, at the front)."""
+        entries = self._entries
+        now = time.monotonic()
+        while entries:
+            key, (_, _, expires_at) = next(iter(entries.items()))
+            if expires_at > now:
+                break
+            del entries[key]
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Remove all cached entries and reset hit/miss counters."""
+        self._entries.clear()
+        self._matrix = None
+        self.hits = 0
+        self.misses = 0
@@ -27,6 +27,14 @@ Environment Variables:
         - APP_NAME: Application name (default: "AutoAssist")
         - DEBUG: Enable debug mode (default: "false")
         - LOG_LEVEL: Logging level (default: "INFO")
+        - CACHE_MAX_ENTRIES: Response cache size, 0 disables (default: 256)
+        - CACHE_EMBEDDING_MODEL: sentence-transformers model for fuzzy cache hits,
+          empty = exact match only (default: "")
+        - CACHE_SIMILARITY_THRESHOLD: Cosine similarity for a fuzzy cache hit (default: 0.92)
+        - CACHE_TTL_SECONDS: Seconds before a cached response expires, 0 = never (default: 0)
+        - PREFETCH_FOLLOWUPS: Pre-generate common follow-up answers per session_id (default: "false")
+        - REQUEST_TIMEOUT_SECONDS: End-to-end /chat time limit, 0 = none (default: 100);
+          keep >= 3 x TIMEOUT_SECONDS + ~4s so the LLM retries fit
     
     LLM Configuration:
         - MODEL_PROVIDER: "local" or "api" (default: "local")
@@ -36,6 +44,13 @@ Environment Variables:
         - TEMPERATURE: Sampling temperature 0.0-1.0 (default: 0.7)
         - MAX_TOKENS: Maximum response length (default: 1024)
         - TIMEOUT_SECONDS: Request timeout in seconds (default: 30)
+        - MAX_BATCH_SIZE: Max prompts coalesced into one LLM call, 1 disables (default: 1)
+        - BATCH_WAIT_MS: Max time to wait for a batch to fill (default: 10)
+        - PRETOKENIZE_PROMPT: Send the system prompt as token IDs, llama.cpp only (default: "false")
+        - MAX_CONCURRENCY: Max in-flight LLM calls per process (default: 8)
+        - USE_AIOHTTP_TRANSPORT: Route LLM calls through aiohttp, needs httpx-aiohttp (default: "false")
+        - PROVIDER_FAMILY: Chat API dialect for prefix caching, "openai" or "anthropic" (optional)
+        - RATE_LIMIT_RPS: Max LLM requests per second per adapter, 0 = unlimited (default: 0)
 
 Security Best Practices:
     - Never commit .env files to version control (use .env.example instead)
@@ -53,8 +68,8 @@ Usage Example:
     print(config.llm.model_name)  # "qwen-2.5-coder"
     print(config.llm.timeout_seconds)  # 270
     
-    # Configuration is immutable (dataclass with frozen=False by default)
-    # For production, consider using frozen=True to prevent accidental changes
+    # Configuration is immutable (frozen dataclasses with __slots__)
+    # Use dataclasses.replace() to derive a modified copy
     ```
 
 Docker Integration:
@@ -66,8 +81,9 @@ Author: AutoAssist Development Team
 License: MIT
 """
 
+import functools
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -82,7 +98,7 @@ load_dotenv()
 # ============================================================================
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
     """
     LLM Configuration Settings
@@ -98,6 +114,15 @@ class LLMConfig:
         temperature (float): Sampling temperature 0.0-1.0 (controls randomness)
         max_tokens (int): Maximum response length in tokens
         timeout_seconds (int): Request timeout in seconds (prevents indefinite hangs)
+        max_batch_size (int): Max concurrent prompts coalesced into one request (1 = no batching)
+        batch_wait_ms (int): Max milliseconds to wait for a batch to fill
+        pretokenize_prompt (bool): Send the static prompt prefix as token IDs (local llama.cpp servers)
+        max_concurrency (int): Max LLM calls in flight at once; extra requests wait their turn
+                               (also the default fan-out of LLMAdapter.batch_generate)
+        use_aiohttp_transport (bool): Back the HTTP client with aiohttp (optional httpx-aiohttp package)
+        provider_family (Optional[str]): Chat API dialect of an "api" provider ("openai" or
+                                         "anthropic"), enabling prompt-prefix caching
+        rate_limit_rps (float): Client-side cap on LLM requests per second (0 = unlimited)
     
     Provider Types:
         - "local": Local LLM server (LMStudio, Ollama, etc.)
@@ -109,6 +134,9 @@ class LLMConfig:
         - 1.0: Maximum creativity and randomness (best for creative writing)
     
     Timeout Considerations:
+        - timeout_seconds applies per attempt; a call that uses all 3 attempts
+          can take ~3 x timeout_seconds plus ~3.3s of backoff
+          (LLMAdapter.call_budget_seconds())
         - Local models: 30-60s usually sufficient
         - Cloud APIs: 30-90s depending on model size
         - Large context windows: May need 120-300s
@@ -151,6 +179,41 @@ class LLMConfig:
     temperature: float = 0.7  # Sampling temperature (0.0-1.0)
     max_tokens: int = 1024  # Maximum response length
     timeout_seconds: int = 30  # Request timeout
+    max_batch_size: int = 1  # Prompts per batched request (1 disables batching)
+    batch_wait_ms: int = 10  # Batch collection window
+    pretokenize_prompt: bool = False  # Send system prompt as token IDs
+    max_concurrency: int = 8  # In-flight LLM call limit
+    use_aiohttp_transport: bool = False  # aiohttp connection pool behind httpx
+    provider_family: Optional[str] = None  # "openai" / "anthropic" chat dialect
+    rate_limit_rps: float = 0  # Outgoing request rate cap (0 = unlimited)
+
+
+def _load_llm_config() -> LLMConfig:
+    """
+    Load LLM configuration from environment variables.
+    
+    Shared helper used by AppConfig.from_env() and as the default factory
+    for AppConfig.llm.
+    
+    Returns:
+        LLMConfig: LLM configuration loaded from environment
+    """
+    return LLMConfig(
+        provider=os.getenv("MODEL_PROVIDER", "local"),
+        model_name=os.getenv("MODEL_NAME", "mistral"),
+        api_endpoint=os.getenv("API_ENDPOINT"),
+        api_token=os.getenv("API_TOKEN"),
+        temperature=float(os.getenv("TEMPERATURE", "0.7")),  # Parse float
+        max_tokens=int(os.getenv("MAX_TOKENS", "1024")),  # Parse int
+        timeout_seconds=int(os.getenv("TIMEOUT_SECONDS", "30")),  # Parse int
+        max_batch_size=int(os.getenv("MAX_BATCH_SIZE", "1")),  # Parse int
+        batch_wait_ms=int(os.getenv("BATCH_WAIT_MS", "10")),  # Parse int
+        pretokenize_prompt=os.getenv("PRETOKENIZE_PROMPT", "false").lower() == "true",  # Parse boolean
+        max_concurrency=int(os.getenv("MAX_CONCURRENCY", "8")),  # Parse int
+        use_aiohttp_transport=os.getenv("USE_AIOHTTP_TRANSPORT", "false").lower() == "true",  # Parse boolean
+        provider_family=os.getenv("PROVIDER_FAMILY"),
+        rate_limit_rps=float(os.getenv("RATE_LIMIT_RPS", "0")),  # Parse float
+    )
 
 
 # ============================================================================
@@ -158,7 +221,7 @@ class LLMConfig:
 # ============================================================================
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """
     Main Application Configuration
@@ -170,12 +233,26 @@ class AppConfig:
         app_name (str): Application name (used in logs and metrics)
         debug (bool): Enable debug mode (verbose logging, detailed errors)
         log_level (str): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        cache_max_entries (int): Response cache size (0 disables caching)
+        cache_embedding_model (str): sentence-transformers model used to match similar
+                                     queries in the cache ("" = exact match only)
+        cache_similarity_threshold (float): Cosine similarity required for a fuzzy cache hit
+                                            (only used with cache_embedding_model)
+        cache_ttl_seconds (float): Lifetime of a cached response in seconds (0 = no expiry)
+        prefetch_followups (bool): Pre-generate answers to common follow-ups in the background
+                                   (requests with a session_id only; 2 extra LLM calls per answer)
+        request_timeout_seconds (float): End-to-end time limit for one /chat query, including
+                                         queueing and retries (0 = no limit). Keep it at
+                                         least 3 x the LLM timeout_seconds plus ~4s, or it
+                                         cuts the adapter's retries short.
         llm (LLMConfig): LLM configuration object
     
     Configuration Loading:
         - Use from_env() class method to load from environment variables
         - Automatically loads .env file if present
         - Provides sensible defaults for development
+        - llm defaults to LLM settings loaded from the environment
+        - Instances are frozen; from_env() is memoized (parsed once per process)
     
     Debug Mode:
         - When enabled: Verbose logging, detailed error messages, auto-reload
@@ -203,25 +280,24 @@ class AppConfig:
     app_name: str = "AutoAssist"
     debug: bool = False
     log_level: str = "INFO"
-    llm: LLMConfig = None
-    
-    def __post_init__(self):
-        """
-        Post-initialization hook (called after __init__).
-        
-        Ensures LLM configuration is loaded if not provided explicitly.
-        This allows creating AppConfig without specifying llm parameter.
-        """
-        if self.llm is None:
-            self.llm = self._load_llm_config()
+    cache_max_entries: int = 256
+    cache_embedding_model: str = ""
+    cache_similarity_threshold: float = 0.92
+    cache_ttl_seconds: float = 0
+    prefetch_followups: bool = False
+    request_timeout_seconds: float = 100
+    llm: LLMConfig = field(default_factory=_load_llm_config)
     
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls) -> "AppConfig":
         """
         Load configuration from environment variables.
         
         This is the recommended way to create AppConfig instances.
         Reads from environment variables with sensible defaults.
+        The result is memoized: the environment is parsed once per process
+        (call AppConfig.from_env.cache_clear() to reload, e.g. in tests).
         
         Returns:
             AppConfig: Configured application instance
@@ -230,6 +306,12 @@ class AppConfig:
             - APP_NAME: Application name (default: "AutoAssist")
             - DEBUG: Enable debug mode - "true" or "false" (default: "false")
             - LOG_LEVEL: Logging level (default: "INFO")
+            - CACHE_MAX_ENTRIES: Response cache size (default: "256")
+            - CACHE_EMBEDDING_MODEL: Embedding model for fuzzy cache hits (default: "" = exact only)
+            - CACHE_SIMILARITY_THRESHOLD: Fuzzy cache hit threshold (default: "0.92")
+            - CACHE_TTL_SECONDS: Cached response lifetime, 0 = no expiry (default: "0")
+            - PREFETCH_FOLLOWUPS: Pre-generate follow-up answers per session_id (default: "false")
+            - REQUEST_TIMEOUT_SECONDS: End-to-end /chat time limit, 0 = none (default: "100")
             - MODEL_PROVIDER: LLM provider - "local" or "api" (default: "local")
             - MODEL_NAME: Model identifier (default: "mistral")
             - API_ENDPOINT: LLM API endpoint URL (optional)
@@ -237,6 +319,13 @@ class AppConfig:
             - TEMPERATURE: Sampling temperature (default: "0.7")
             - MAX_TOKENS: Maximum response length (default: "1024")
             - TIMEOUT_SECONDS: Request timeout (default: "30")
+            - MAX_BATCH_SIZE: Prompts per batched LLM request (default: "1")
+            - BATCH_WAIT_MS: Batch collection window (default: "10")
+            - PRETOKENIZE_PROMPT: Send system prompt as token IDs (default: "false")
+            - MAX_CONCURRENCY: In-flight LLM call limit (default: "8")
+            - USE_AIOHTTP_TRANSPORT: Use the aiohttp-backed transport (default: "false")
+            - PROVIDER_FAMILY: Chat API dialect, "openai" or "anthropic" (optional)
+            - RATE_LIMIT_RPS: Outgoing LLM requests per second, 0 = unlimited (default: "0")
         
         Example:
             ```python
@@ -256,35 +345,18 @@ class AppConfig:
             debug=os.getenv("DEBUG", "false").lower() == "true",  # Parse boolean
             log_level=os.getenv("LOG_LEVEL", "INFO"),
             
+            # Response cache settings
+            cache_max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "256")),  # Parse int
+            cache_embedding_model=os.getenv("CACHE_EMBEDDING_MODEL", ""),
+            cache_similarity_threshold=float(os.getenv("CACHE_SIMILARITY_THRESHOLD", "0.92")),  # Parse float
+            cache_ttl_seconds=float(os.getenv("CACHE_TTL_SECONDS", "0")),  # Parse float
+            prefetch_followups=os.getenv("PREFETCH_FOLLOWUPS", "false").lower() == "true",  # Parse boolean
+            
+            # Request settings
+            request_timeout_seconds=float(os.getenv("REQUEST_TIMEOUT_SECONDS", "100")),  # Parse float
+            
             # LLM settings
-            llm=LLMConfig(
-                provider=os.getenv("MODEL_PROVIDER", "local"),
-                model_name=os.getenv("MODEL_NAME", "mistral"),
-                api_endpoint=os.getenv("API_ENDPOINT"),
-                api_token=os.getenv("API_TOKEN"),
-                temperature=float(os.getenv("TEMPERATURE", "0.7")),  # Parse float
-                max_tokens=int(os.getenv("MAX_TOKENS", "1024")),  # Parse int
-                timeout_seconds=int(os.getenv("TIMEOUT_SECONDS", "30")),  # Parse int
-            )
-        )
-    
-    def _load_llm_config(self) -> LLMConfig:
-        """
-        Load LLM configuration from environment variables.
-        
-        Internal helper method called by __post_init__ if llm is not provided.
-        
-        Returns:
-            LLMConfig: LLM configuration loaded from environment
-        """
-        return LLMConfig(
-            provider=os.getenv("MODEL_PROVIDER", "local"),
-            model_name=os.getenv("MODEL_NAME", "mistral"),
-            api_endpoint=os.getenv("API_ENDPOINT"),
-            api_token=os.getenv("API_TOKEN"),
-            temperature=float(os.getenv("TEMPERATURE", "0.7")),
-            max_tokens=int(os.getenv("MAX_TOKENS", "1024")),
-            timeout_seconds=int(os.getenv("TIMEOUT_SECONDS", "30")),
+            llm=_load_llm_config(),
         )
 
 
@@ -14,21 +14,51 @@ Architecture:
 Key Features:
     - Automatic retry logic with exponential backoff (3 attempts)
     - Configurable timeouts to handle slow model responses
+    - Persistent pooled HTTP client (keep-alive, HTTP/2 over TLS)
     - Bearer token authentication support
     - Graceful error handling with detailed logging
     - Provider-agnostic interface for easy switching
+    - Optional micro-batching of concurrent requests into one LLM call
+    - Token streaming via generate_stream() (Server-Sent Events)
+    - Exact-match response cache for deterministic (temperature=0) calls
+    - Prompt-prefix caching hook via generate_with_prefix()
+    - Optional client-side rate limit (token bucket) to stay under provider quotas
 
 Retry Strategy:
     - Max retries: 3 attempts
-    - Backoff: Linear (1s, 2s, 3s delays between retries)
-    - Handles both HTTP errors and connection failures
+    - Backoff: Exponential with 10% jitter (~1s, ~2s between retries)
+    - 429/503 responses wait at least as long as their Retry-After header
+    - Retries only transient failures: 408/429/5xx responses, connection
+      errors, timeouts and dropped connections
+    - Other errors (e.g. 400/401/404, malformed JSON) fail immediately
     - Preserves last error for debugging
 
+Micro-Batching:
+    - Enabled when LLMConfig.max_batch_size > 1
+    - submit() queues the prompt; a background worker collects up to
+      max_batch_size prompts (or waits batch_wait_ms) and sends them as a
+      single list-prompt /completions request
+    - Each batch is sent as its own task, so batches overlap rather than
+      waiting for the previous one to finish
+    - Amortises per-request overhead and lets the server batch on the GPU
+    - Requires a server that accepts list prompts (OpenAI, vLLM, TGI)
+
+Prompt-Prefix Caching:
+    - Providers cache and discount a prompt's leading tokens when several
+      requests share them, but only for an identical prefix
+    - Rule: static content (system prompt, instructions) first, dynamic
+      content (user query) last
+    - generate_with_prefix(static_prefix, dynamic) keeps the two apart so
+      adapters can mark the prefix for caching (Anthropic cache_control)
+
 Usage Example:
     ```python
     config = LLMConfig(provider="local", model_name="qwen-2.5", ...)
     adapter = LLMAdapterFactory.create_adapter(config)
     response = await adapter.generate("What is the weather?")
+    
+    # Coalesces with other concurrent callers when batching is enabled
+    response = await adapter.submit("What is the weather?")
     ```
 
 Security Notes:
@@ -41,11 +71,265 @@ License: MIT
 """
 
 import asyncio
+import hashlib
+import importlib.util
+import logging
+import random
+import time
 import httpx
+import orjson
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple, Type, Union
 from app.config import LLMConfig
 
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the h2 package (installed via httpx[http2]); without it,
+# fall back to HTTP/1.1 keep-alive instead of failing at client creation
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# A prompt is either plain text or, for llama.cpp-style servers, a mixed
+# list of pre-computed token IDs and text (e.g. [1, 3492, 88, "rest of prompt"])
+Prompt = Union[str, List[Union[int, str]]]
+
+
+def _extract_texts(data: Dict[str, Any], count: int) -> List[str]:
+    """
+    Extract generated texts from an OpenAI-style completion response.
+    
+    Choices are ordered by their "index" field so that batched responses
+    line up with the prompts that produced them.
+    
+    Args:
+        data (Dict[str, Any]): Parsed JSON response body
+        count (int): Number of prompts sent in the request
+    
+    Returns:
+        List[str]: One stripped text per prompt ("" for missing choices)
+    """
+    texts = [""] * count
+    for position, choice in enumerate(data.get("choices", [])):
+        index = choice.get("index", position)
+        if 0 <= index < count:
+            texts[index] = choice.get("text", "").strip()
+    return texts
+
+
+def _extract_chat_text(data: Dict[str, Any]) -> str:
+    """
+    Extract the generated text from a chat-format response.
+    
+    Handles both OpenAI chat completions ({"choices": [{"message": {...}}]})
+    and Anthropic messages ({"content": [{"type": "text", "text": ...}]}).
+    
+    Args:
+        data (Dict[str, Any]): Parsed JSON response body
+    
+    Returns:
+        str: Stripped response text ("" if the response has none)
+    """
+    if "choices" in data:
+        choices = data["choices"] or [{}]
+        return ((choices[0].get("message") or {}).get("content") or "").strip()
+    return "".join(block.get("text", "") for block in data.get("content", [])).strip()
+
+
+async def _iter_stream_texts(response: httpx.Response) -> AsyncIterator[str]:
+    """
+    Yield generated text chunks from an OpenAI-style streaming response.
+    
+    Parses Server-Sent Events ("data: {...}" lines) until "data: [DONE]".
+    Completion chunks ({"text": ...}), chat-completion chunks
+    ({"delta": {"content": ...}}) and Anthropic message deltas
+    ({"type": "content_block_delta", "delta": {"text": ...}}) are
+    understood, so the same parser serves /completions, /chat/completions
+    and /v1/messages streams. Leading whitespace is
+    dropped until the first non-empty chunk, matching the stripped output
+    of non-streaming calls.
+    
+    Args:
+        response (httpx.Response): Open streaming response
+    
+    Yields:
+        str: Text chunks in generation order
+    """
+    started = False
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            break
+        event = orjson.loads(payload)
+        if event.get("type") == "content_block_delta":
+            text = event["delta"].get("text") or ""
+        else:
+            choice = (event.get("choices") or [{}])[0]
+            text = choice.get("text") or (choice.get("delta") or {}).get("content") or ""
+        if not started:
+            text = text.lstrip()
+            started = bool(text)
+        if text:
+            yield text
+
+
+def _build_client(config: LLMConfig, headers: Dict[str, str]) -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP client used by an adapter.
+    
+    By default this is httpx's native pool, negotiating HTTP/2 via ALPN so
+    concurrent requests to one host multiplex over a single TLS connection
+    (HTTP/1.1 keep-alive if the server or environment lacks HTTP/2). With
+    use_aiohttp_transport enabled, requests are instead routed through an
+    aiohttp connection pool (via the optional httpx-aiohttp package), which
+    holds up better under many concurrent calls. The httpx API is unchanged
+    either way.
+    
+    Args:
+        config (LLMConfig): LLM configuration (timeout and transport choice)
+        headers (Dict[str, str]): Default headers sent with every request
+    
+    Returns:
+        httpx.AsyncClient: Client to keep for the adapter's lifetime
+    
+    Raises:
+        RuntimeError: If the aiohttp transport is requested but not installed
+    """
+    if not config.use_aiohttp_transport:
+        return httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            headers=headers,
+            timeout=config.timeout_seconds,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    
+    try:
+        import aiohttp
+        from httpx_aiohttp import AiohttpTransport
+    except ImportError as e:
+        raise RuntimeError(
+            "USE_AIOHTTP_TRANSPORT=true requires the httpx-aiohttp package, "
+            "which needs httpx>=0.27 (pip install 'httpx>=0.27' httpx-aiohttp==0.1.8)"
+        ) from e
+    
+    # aiohttp owns pooling here (HTTP/1.1 keep-alive), so httpx limits don't apply
+    transport = AiohttpTransport(
+        client=lambda: aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=500, keepalive_timeout=300)
+        )
+    )
+    return httpx.AsyncClient(transport=transport, headers=headers, timeout=config.timeout_seconds)
+
+
+def _fail_futures(batch: List[Tuple[Any, asyncio.Future]], error: Exception) -> None:
+    """Set error on every still-pending future of a micro-batch."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+# Transport errors worth retrying (server unreachable, slow, or dropped the connection)
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.TimeoutException, httpx.RemoteProtocolError)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Decide whether a failed LLM request could succeed if retried.
+    
+    Client errors such as 400 (bad request), 401 (invalid token) or
+    404 (unknown model) will fail the same way every time, so only
+    408/429/5xx responses and transient transport errors are retried.
+    
+    Args:
+        error (Exception): Error raised by the request attempt
+    
+    Returns:
+        bool: True if the request should be retried
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status in (408, 429)
+    return isinstance(error, _RETRYABLE_ERRORS)
+
+
+def _backoff_delay(base_delay: float, attempt: int, error: Optional[Exception]) -> float:
+    """
+    Compute how long to wait before the next retry.
+    
+    Exponential backoff (base_delay * 2^attempt) plus up to 10% random
+    jitter, so concurrent callers that failed together don't retry in
+    lockstep. For 429/503 responses a numeric Retry-After header is
+    honoured as a lower bound.
+    
+    Args:
+        base_delay (float): Delay before the first retry, in seconds
+        attempt (int): Zero-based index of the attempt that just failed
+        error (Optional[Exception]): Error raised by that attempt
+    
+    Returns:
+        float: Seconds to sleep before retrying
+    """
+    delay = base_delay * (2 ** attempt)
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code in (429, 503):
+        retry_after = error.response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form - fall back to the computed backoff
+    return delay + random.uniform(0, delay * 0.1)
+
+
+class AsyncTokenBucket:
+    """
+    Async Token Bucket Rate Limiter
+    
+    Allows `rate` acquisitions per second on average, with bursts of up to
+    `capacity`. Callers over the limit sleep before their request instead of
+    sending it and getting a 429 back, which would cost a round-trip plus a
+    backoff delay.
+    
+    Acquisitions reserve tokens immediately (the balance may go negative)
+    and then sleep off the deficit, so waiters are served in arrival order
+    without a lock. Safe within a single event loop.
+    
+    Example:
+        ```python
+        bucket = AsyncTokenBucket(rate=5)  # 5 requests/second
+        await bucket.acquire()
+        response = await client.post(...)
+        ```
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rate (float): Tokens added per second (must be > 0)
+            capacity (Optional[float]): Maximum burst size (default: max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+    
+    async def acquire(self, n: float = 1) -> None:
+        """
+        Take n tokens, sleeping until they are available.
+        
+        Args:
+            n (float): Number of tokens to take (default: 1)
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= n
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
 
 # ============================================================================
 # ABSTRACT BASE CLASS
@@ -62,12 +346,56 @@ class LLMAdapter(ABC):
     Attributes:
         config (LLMConfig): Configuration object containing model settings,
                            endpoints, tokens, and timeout values
+        max_retries (int): Maximum number of retry attempts (default: 3)
+        retry_delay (float): Base delay in seconds between retries (default: 1.0)
+    
+    Shared Request Path:
+        The retry loop, response cache and SSE streaming for OpenAI-style
+        /completions endpoints live here once. Subclasses only describe
+        their endpoint by setting, in __init__:
+        - _completions_url: URL completion requests are POSTed to
+        - _base_payload: Static body fields (model, sampling settings)
+        and override _default_headers() if the backend authenticates
+        differently from "Authorization: Bearer <token>".
+    
+    Connection Reuse:
+        httpx.AsyncClient instances are shared at class level, one per
+        (endpoint, timeout, transport, headers), so every adapter the factory builds
+        for the same backend reuses one connection pool. TCP/TLS handshakes
+        are paid once and concurrent calls share pooled connections
+        (multiplexed over HTTP/2 when the server negotiates it). Static
+        headers, including the auth token, are set on the client once
+        rather than passed with every request.
+        Set use_aiohttp_transport to back the client with aiohttp's pool.
+        An adapter's aclose() (or leaving `async with adapter:`) only stops
+        its own background work; call LLMAdapter.aclose_clients() once on
+        application shutdown to release the shared connections. Adapters
+        look the client up on every request rather than keeping it, so
+        they keep working (on a new client) after aclose_clients().
+    
+    Rate Limiting:
+        With rate_limit_rps > 0, every outgoing request (including retries
+        and streams) first takes a slot from an AsyncTokenBucket, so bursts
+        from batch_generate() queue locally instead of tripping provider
+        429s. Cache hits don't consume slots.
+    
+    Response Cache:
+        With temperature == 0 the output for a given prompt is deterministic,
+        so generate() and submit() answer repeated byte-identical prompts from an LRU
+        cache (up to 1024 entries) keyed by a SHA-256 of model, sampling
+        settings and prompt. Non-zero temperatures always call the backend.
     
     Design Pattern:
         Uses the Template Method pattern - subclasses implement specific
         behavior while maintaining a consistent interface.
     """
     
+    # Names the backend in error messages, e.g. "Local LLM generation failed ..."
+    _error_label = "LLM"
+    
+    # Shared HTTP clients: (endpoint, timeout, aiohttp transport?, headers) -> client
+    _CLIENTS: Dict[Tuple[Any, ...], httpx.AsyncClient] = {}
+    
     def __init__(self, config: LLMConfig):
         """
         Initialize the adapter with configuration.
@@ -76,14 +404,485 @@ class LLMAdapter(ABC):
             config (LLMConfig): LLM configuration object with provider-specific settings
         """
         self.config = config
+        self.max_retries = 3  # Retry up to 3 times for transient failures
+        self.retry_delay = 1.0  # Exponential backoff base: ~1s, ~2s
+        # Persistent HTTP client, shared with other adapters for the same backend;
+        # auth/content-type headers live on the client, not on each request.
+        # Only the headers are kept - the client is looked up on every use
+        # (see _client), so closing the shared clients never strands an adapter.
+        self._headers = self._default_headers(config)
+        self._client_key = self._shared_client_key(config, self._headers)
+        # Micro-batching state (created lazily on first submit())
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker_task: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()  # Batches in flight (strong refs until done)
+        # Client-side request rate limit (None = unlimited)
+        self._rate_limiter: Optional[AsyncTokenBucket] = (
+            AsyncTokenBucket(rate=config.rate_limit_rps) if config.rate_limit_rps > 0 else None
+        )
+        # Exact-match LRU of prompt hash -> response (temperature == 0 only)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_max = 1024
+    
+    def _cache_key(self, prompt: Prompt) -> Optional[str]:
+        """
+        Build the response-cache key for a prompt.
+        
+        Args:
+            prompt (Prompt): Prompt about to be sent to the LLM
+        
+        Returns:
+            Optional[str]: SHA-256 hex digest, or None if sampling is
+                non-deterministic (temperature != 0) and caching is off
+        """
+        if self.config.temperature != 0:
+            return None
+        raw = orjson.dumps(
+            {
+                "m": self.config.model_name,
+                "t": self.config.temperature,
+                "mt": self.config.max_tokens,
+                "p": prompt,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(raw).hexdigest()
+    
+    def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        """Return the cached response for key (refreshing its LRU position), or None."""
+        if key is None:
+            return None
+        response = self._cache.get(key)
+        if response is not None:
+            self._cache.move_to_end(key)
+        return response
+    
+    def _cache_put(self, key: Optional[str], response: str) -> None:
+        """Store a non-empty response under key, evicting the least recently used entry if full."""
+        if key is None or not response:
+            return
+        self._cache[key] = response
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+    
+    async def _cached_completion(self, prompt: Prompt) -> str:
+        """
+        Complete a single prompt, serving deterministic repeats from the cache.
+        
+        Args:
+            prompt (Prompt): Input prompt to send to the LLM
+        
+        Returns:
+            str: Generated text response, stripped of leading/trailing whitespace
+        
+        Raises:
+            RuntimeError: If all retry attempts fail
+        """
+        key = self._cache_key(prompt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        response = (await self._complete(prompt))[0]
+        self._cache_put(key, response)
+        return response
+    
+    async def _complete(self, prompt: Union[Prompt, List[Prompt]], count: int = 1) -> List[str]:
+        """
+        Send a completion request with retry logic.
+        
+        Args:
+            prompt (Union[Prompt, List[Prompt]]): Single prompt or list of prompts
+            count (int): Number of prompts in the request (1 for a single prompt)
+        
+        Returns:
+            List[str]: One generated text per prompt
+        
+        Raises:
+            RuntimeError: If all retry attempts fail or a non-retryable error
+                occurs, includes details of last error
+        """
+        data = await self._post(self._completions_url, {**self._base_payload, "prompt": prompt})
+        return _extract_texts(data, count)
+    
+    async def _post(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a JSON payload with retry logic and return the parsed response.
+        
+        Args:
+            url (str): Endpoint URL
+            payload (Dict[str, Any]): Request body
+        
+        Returns:
+            Dict[str, Any]: Parsed JSON response body
+        
+        Raises:
+            RuntimeError: If all retry attempts fail or a non-retryable error
+                occurs, includes details of last error
+        """
+        last_error = None
+        body = orjson.dumps(payload)
+        
+        # Retry loop: attempt up to max_retries times
+        for attempt in range(self.max_retries):
+            try:
+                # Wait for a rate-limit slot (retries count against the limit too)
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire()
+                
+                # Step 1: Send POST request to the LLM endpoint
+                # Reuses the adapter's pooled client (static headers preset on it);
+                # orjson serializes the body once (faster than httpx's stdlib json)
+                response = await self._client.post(url, content=body)
+                
+                # Step 2: Raise exception for HTTP error status codes (4xx, 5xx)
+                response.raise_for_status()
+                
+                # Step 3: Parse JSON response (orjson, straight from bytes)
+                return orjson.loads(response.content)
+                
+            except httpx.HTTPStatusError as e:
+                # HTTP error (4xx, 5xx) - log details for debugging
+                last_error = e
+                # Log at most 512 raw bytes of the body - skips decoding (and
+                # charset detection on) large proxy error pages
+                logger.warning(
+                    "HTTP error on attempt %d: %s - %r", attempt + 1, e.response.status_code, e.response.content[:512]
+                )
+                if attempt < self.max_retries - 1 and _is_retryable(e):
+                    # Wait before retrying (exponential backoff + jitter, honours Retry-After)
+                    await asyncio.sleep(_backoff_delay(self.retry_delay, attempt, e))
+                    continue
+                break  # Non-retryable or out of attempts - fail fast
+                    
+            except Exception as e:
+                # Catch-all for connection errors, timeouts, JSON parsing errors, etc.
+                last_error = e
+                logger.warning("Error on attempt %d: %s - %s", attempt + 1, type(e).__name__, e)
+                if attempt < self.max_retries - 1 and _is_retryable(e):
+                    # Wait before retrying
+                    await asyncio.sleep(_backoff_delay(self.retry_delay, attempt, e))
+                    continue
+                break  # Non-retryable or out of attempts - fail fast
+        
+        # Retries exhausted or error not retryable - raise final error
+        raise RuntimeError(f"{self._error_label} generation failed after {attempt + 1} attempts: {str(last_error)}")
+    
+    async def _stream_completion(self, prompt: Prompt) -> AsyncIterator[str]:
+        """
+        Stream a completion request ("stream": true) as text chunks.
+        
+        Args:
+            prompt (Prompt): Input prompt to send to the LLM
+        
+        Yields:
+            str: Text chunks in generation order
+        
+        Raises:
+            httpx.HTTPError: On connection or HTTP errors (not retried)
+        """
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        async with self._client.stream(
+            "POST",
+            self._completions_url,
+            content=orjson.dumps({**self._base_payload, "prompt": prompt, "stream": True}),
+        ) as response:
+            response.raise_for_status()
+            async for text in _iter_stream_texts(response):
+                yield text
+    
+    def _default_headers(self, config: LLMConfig) -> Dict[str, str]:
+        """
+        Build the static headers sent with every request.
+        
+        Bodies are pre-serialized with orjson, so Content-Type is set
+        explicitly. The Bearer token is added when configured.
+        
+        Args:
+            config (LLMConfig): LLM configuration (api_token)
+        
+        Returns:
+            Dict[str, str]: Header name -> value
+        """
+        headers = {"Content-Type": "application/json"}
+        if config.api_token:
+            headers["Authorization"] = f"Bearer {config.api_token}"
+        return headers
+    
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Open shared HTTP client for this adapter's backend (one dict lookup when warm)."""
+        client = self._CLIENTS.get(self._client_key)
+        if client is None or client.is_closed:
+            client = self._get_client(self.config, self._headers)
+        return client
+    
+    @staticmethod
+    def _shared_client_key(config: LLMConfig, headers: Dict[str, str]) -> Tuple[Any, ...]:
+        """Key of the shared client: (endpoint, timeout, aiohttp transport?, headers)."""
+        return (
+            config.api_endpoint,
+            config.timeout_seconds,
+            config.use_aiohttp_transport,
+            tuple(sorted(headers.items())),
+        )
+    
+    @classmethod
+    def _get_client(cls, config: LLMConfig, headers: Dict[str, str]) -> httpx.AsyncClient:
+        """
+        Return the shared HTTP client for this backend, creating it if needed.
+        
+        Args:
+            config (LLMConfig): LLM configuration (endpoint, timeout, transport)
+            headers (Dict[str, str]): Default headers for the client
+        
+        Returns:
+            httpx.AsyncClient: Open client shared by all adapters with the same key
+        """
+        key = cls._shared_client_key(config, headers)
+        client = cls._CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = _build_client(config, headers)
+            cls._CLIENTS[key] = client
+        return client
+    
+    @classmethod
+    async def aclose_clients(cls) -> None:
+        """
+        Close every shared HTTP client. Call once on application shutdown.
+        
+        Adapters don't hold on to a client, so existing adapters (e.g. a
+        module-level agent reused across app restarts in tests) open a
+        fresh client on their next request.
+        """
+        clients = list(cls._CLIENTS.values())
+        cls._CLIENTS.clear()
+        for client in clients:
+            await client.aclose()
+    
+    def call_budget_seconds(self) -> float:
+        """
+        Worst-case duration of one submit() call that uses all its retries.
+        
+        Every attempt may run up to timeout_seconds, and each retry waits
+        the exponential backoff first (~1s, ~2s plus up to 10% jitter).
+        Batched submissions also wait up to batch_wait_ms for their batch
+        to fill. Callers that put an overall deadline on an LLM call should
+        allow at least this much, or the retries never get a chance to run.
+        A Retry-After header longer than the backoff can still exceed it.
+        
+        Returns:
+            float: Budget in seconds
+        """
+        attempts = self.config.timeout_seconds * self.max_retries
+        backoff = sum(self.retry_delay * 2 ** attempt for attempt in range(self.max_retries - 1)) * 1.1
+        batch_wait = self.config.batch_wait_ms / 1000 if self.config.max_batch_size > 1 else 0
+        return attempts + backoff + batch_wait
+    
+    async def warmup(self) -> None:
+        """
+        Open a pooled connection to the backend before the first request.
+        
+        Sends a bodiless GET to the completions URL so DNS resolution, the
+        TCP connect and the TLS handshake happen at startup. The response
+        (usually 404/405) is discarded and no tokens are generated; the
+        connection stays in the client's keep-alive pool for the first
+        real request. Failures are logged and ignored, since the backend
+        may simply not be up yet.
+        """
+        if not self._completions_url:
+            return
+        try:
+            await self._client.get(self._completions_url)
+        except (httpx.HTTPError, RuntimeError) as e:
+            # RuntimeError: transport not usable (e.g. client closed, missing httpx-aiohttp)
+            logger.warning("LLM warmup failed: %r", e)
+    
+    async def aclose(self) -> None:
+        """
+        Release resources held by the adapter.
+        
+        Stops the batch worker (if running) and cancels batches in flight.
+        Callers still waiting on submit() - including prompts queued but
+        not yet batched - get a RuntimeError instead of hanging. The HTTP
+        client is shared with other adapters and is closed by
+        aclose_clients() instead.
+        """
+        if self._batch_worker_task is not None:
+            self._batch_worker_task.cancel()
+            self._batch_worker_task = None
+        for task in list(self._batch_tasks):
+            task.cancel()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        
+        if self._batch_queue is not None:
+            while not self._batch_queue.empty():
+                _, future = self._batch_queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("LLM adapter closed"))
+    
+    async def __aenter__(self) -> "LLMAdapter":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def generate_batch(self, prompts: List[Prompt]) -> List[str]:
+        """
+        Generate responses for several prompts.
+        
+        The default implementation issues one generate() call per prompt
+        concurrently. Subclasses override this to send all prompts in a
+        single request.
+        
+        Args:
+            prompts (List[Prompt]): Prompts to send to the LLM
+        
+        Returns:
+            List[str]: Generated responses, in the same order as prompts
+        """
+        return list(await asyncio.gather(*(self.generate(prompt) for prompt in prompts)))
+    
+    async def batch_generate(
+        self,
+        prompts: List[Prompt],
+        max_concurrent: Optional[int] = None,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Run generate() for many prompts concurrently, with bounded fan-out.
+        
+        Unlike generate_batch(), each prompt is its own request (so the
+        response cache and retries apply per prompt), but at most
+        max_concurrent requests are in flight at once over the shared
+        connection pool. One failing prompt does not cancel the others.
+        
+        Args:
+            prompts (List[Prompt]): Prompts to send to the LLM
+            max_concurrent (Optional[int]): Concurrency limit
+                                            (default: config.max_concurrency)
+        
+        Returns:
+            List[Union[str, BaseException]]: Response text per prompt, in order,
+                                             or the exception that prompt raised
+        
+        Example:
+            ```python
+            results = await adapter.batch_generate(prompts, max_concurrent=4)
+            answers = [r for r in results if isinstance(r, str)]
+            ```
+        """
+        semaphore = asyncio.Semaphore(max_concurrent or self.config.max_concurrency)
+        
+        async def _generate_one(prompt: Prompt) -> str:
+            async with semaphore:
+                return await self.generate(prompt)
+        
+        return list(
+            await asyncio.gather(*(_generate_one(prompt) for prompt in prompts), return_exceptions=True)
+        )
+    
+    async def submit(self, prompt: Prompt) -> str:
+        """
+        Generate a response, coalescing with concurrent callers if enabled.
+        
+        When max_batch_size <= 1 this is equivalent to generate(). Otherwise
+        the prompt is queued and answered by the background batch worker.
+        Either way the response cache applies: deterministic repeats are
+        answered before queueing, and batch results are stored.
+        
+        Args:
+            prompt (Prompt): Input prompt to send to the LLM
+        
+        Returns:
+            str: Generated text response from the model
+        
+        Raises:
+            RuntimeError: If generation of the batch fails
+        """
+        if self.config.max_batch_size <= 1:
+            return await self.generate(prompt)
+        
+        cached = self._cache_get(self._cache_key(prompt))
+        if cached is not None:
+            return cached
+        
+        # Start the worker lazily - it needs a running event loop
+        if self._batch_worker_task is None or self._batch_worker_task.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_worker_task = asyncio.create_task(self._batch_worker())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((prompt, future))
+        return await future
+    
+    async def _batch_worker(self) -> None:
+        """
+        Background task that drains the queue into batched LLM calls.
+        
+        Waits for the first prompt, then keeps collecting until either
+        max_batch_size prompts are queued or batch_wait_ms has elapsed,
+        and dispatches the batch as its own task (_run_batch). The worker
+        goes straight back to collecting, so several batches can be in
+        flight at once instead of queueing behind the slowest one; the
+        agent's max_concurrency limit bounds how many callers wait here.
+        """
+        loop = asyncio.get_running_loop()
+        max_wait = self.config.batch_wait_ms / 1000
+        
+        while True:
+            batch: List[Tuple[Prompt, asyncio.Future]] = [await self._batch_queue.get()]
+            deadline = loop.time() + max_wait
+            
+            # Fill the batch until it's full or the collection window closes
+            try:
+                while len(batch) < self.config.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._batch_queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Closed mid-collection: don't strand the prompts already taken
+                _fail_futures(batch, RuntimeError("LLM adapter closed"))
+                raise
+            
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[Prompt, asyncio.Future]]) -> None:
+        """
+        Send one collected batch and fan the results (or the error) out to its callers.
+        
+        Args:
+            batch (List[Tuple[Prompt, asyncio.Future]]): Prompts and their callers' futures
+        """
+        try:
+            results = await self.generate_batch([prompt for prompt, _ in batch])
+        except asyncio.CancelledError:
+            _fail_futures(batch, RuntimeError("LLM adapter closed"))
+            raise
+        except Exception as e:
+            _fail_futures(batch, e)
+            return
+        
+        for (prompt, future), result in zip(batch, results):
+            self._cache_put(self._cache_key(prompt), result)
+            if not future.done():
+                future.set_result(result)
     
     @abstractmethod
-    async def generate(self, prompt: str) -> str:
+    async def generate(self, prompt: Prompt) -> str:
         """
         Generate text response from LLM (must be implemented by subclasses).
         
         Args:
-            prompt (str): Input text prompt to send to the LLM
+            prompt (Prompt): Input text prompt (or mixed token/text prompt) to send to the LLM
         
         Returns:
             str: Generated text response from the model
@@ -94,6 +893,60 @@ class LLMAdapter(ABC):
         """
         pass
     
+    async def generate_with_prefix(self, static_prefix: str, dynamic: str) -> str:
+        """
+        Generate a response for a prompt split into static and dynamic parts.
+        
+        Provider prompt caches only match an identical leading prefix, so
+        everything that is the same across requests (system prompt, fixed
+        instructions) belongs in static_prefix, and only the per-request
+        part (the user query) in dynamic.
+        
+        The default implementation sends static_prefix + dynamic through
+        generate(), which already puts the cacheable part first. Adapters
+        with a structured API override this to mark the prefix explicitly.
+        
+        Args:
+            static_prefix (str): Prompt text shared by every request
+            dynamic (str): Per-request prompt text appended after the prefix
+        
+        Returns:
+            str: Generated text response from the model
+        """
+        return await self.generate(static_prefix + dynamic)
+    
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        """
+        Stream the generated response in chunks as the model produces them.
+        
+        The default implementation yields the full generate() result as a
+        single chunk. Subclasses override this to stream from the backend.
+        
+        Args:
+            prompt (Prompt): Input prompt to send to the LLM
+        
+        Yields:
+            str: Text chunks in generation order
+        """
+        yield await self.generate(prompt)
+    
+    async def tokenize(self, text: str) -> List[int]:
+        """
+        Convert text into the model's token IDs.
+        
+        Only backends that expose a tokenizer endpoint support this.
+        
+        Args:
+            text (str): Text to tokenize
+        
+        Returns:
+            List[int]: Token IDs
+        
+        Raises:
+            NotImplementedError: If the backend cannot tokenize
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support tokenization")
+    
     @abstractmethod
     def validate_config(self) -> bool:
         """
@@ -131,8 +984,16 @@ class LocalLLMAdapter(LLMAdapter):
             "model": "model-name",
             "prompt": "user prompt",
             "temperature": 0.7,
-            "max_tokens": 2000
+            "max_tokens": 2000,
+            "cache_prompt": true
         }
+        
+        cache_prompt asks llama.cpp-based servers (LMStudio, llama-server) to
+        keep the KV cache for the shared prompt prefix between requests.
+        Servers that don't support it ignore the field.
+        
+        llama.cpp servers also expose POST /tokenize (at the server root),
+        used by tokenize() so a static prompt prefix can be sent as token IDs.
     
     Docker Networking:
         When running in Docker, use host.docker.internal instead of localhost
@@ -151,6 +1012,8 @@ class LocalLLMAdapter(LLMAdapter):
         ```
     """
     
+    _error_label = "Local LLM"
+    
     def __init__(self, config: LLMConfig):
         """
         Initialize local LLM adapter with retry configuration.
@@ -161,10 +1024,19 @@ class LocalLLMAdapter(LLMAdapter):
         super().__init__(config)
         # Default to localhost if no endpoint specified
         self.endpoint = config.api_endpoint or "http://localhost:1234/v1"
-        self.max_retries = 3  # Retry up to 3 times for transient failures
-        self.retry_delay = 1.0  # Linear backoff: 1s, 2s, 3s
+        
+        # Static request parts, built once (config is immutable)
+        # Optional Bearer token (if LMStudio requires authentication) is set
+        # on the shared client by the base class
+        self._base_payload = {
+            "model": config.model_name,  # e.g., "qwen-2.5-coder"
+            "temperature": config.temperature,  # Controls randomness (0.0-1.0)
+            "max_tokens": config.max_tokens,  # Max response length
+            "cache_prompt": True,  # Reuse KV cache for the static system prompt prefix
+        }
+        self._completions_url = f"{self.endpoint}/completions"
     
-    async def generate(self, prompt: str) -> str:
+    async def generate(self, prompt: Prompt) -> str:
         """
         Generate text from local LLM with automatic retry logic.
         
@@ -172,7 +1044,7 @@ class LocalLLMAdapter(LLMAdapter):
         like network hiccups, temporary server overload, or model loading delays.
         
         Args:
-            prompt (str): Input text prompt to send to the local LLM
+            prompt (Prompt): Input text prompt (or mixed token/text prompt) to send to the local LLM
         
         Returns:
             str: Generated text response, stripped of leading/trailing whitespace
@@ -182,14 +1054,15 @@ class LocalLLMAdapter(LLMAdapter):
         
         Retry Behavior:
             - Attempt 1: Immediate
-            - Attempt 2: After 1 second delay
-            - Attempt 3: After 2 second delay
-            - Total max wait: 3 seconds across all retries
+            - Attempt 2: After ~1 second delay (plus up to 10% jitter)
+            - Attempt 3: After ~2 second delay (plus up to 10% jitter)
+            - 429/503: Waits at least the server's Retry-After seconds
         
         Error Handling:
             - HTTPStatusError: HTTP 4xx/5xx responses (e.g., 500 Internal Server Error)
             - ConnectError: Cannot reach the server (e.g., LMStudio not running)
             - TimeoutError: Request exceeds configured timeout (default: 270s)
+            - Non-retryable errors (e.g., 404 unknown model) fail on the first attempt
         
         Example Response Format:
             {
@@ -198,59 +1071,73 @@ class LocalLLMAdapter(LLMAdapter):
                 ]
             }
         """
-        last_error = None
+        # Deterministic calls: serve byte-identical prompts from the cache
+        return await self._cached_completion(prompt)
+    
+    async def generate_batch(self, prompts: List[Prompt]) -> List[str]:
+        """
+        Generate responses for several prompts in a single request.
         
-        # Retry loop: attempt up to max_retries times
-        for attempt in range(self.max_retries):
-            try:
-                # Step 1: Prepare authentication headers
-                headers = {"Content-Type": "application/json"}
-                if self.config.api_token:
-                    # Optional: Add Bearer token if LMStudio requires authentication
-                    headers["Authorization"] = f"Bearer {self.config.api_token}"
-                
-                # Step 2: Create async HTTP client with configured timeout
-                # Timeout prevents indefinite hangs (important for production)
-                async with httpx.AsyncClient(timeout=self.config.timeout_seconds) as client:
-                    # Step 3: Send POST request to /v1/completions endpoint
-                    response = await client.post(
-                        f"{self.endpoint}/completions",
-                        headers=headers,
-                        json={
-                            "model": self.config.model_name,  # e.g., "qwen-2.5-coder"
-                            "prompt": prompt,
-                            "temperature": self.config.temperature,  # Controls randomness (0.0-1.0)
-                            "max_tokens": self.config.max_tokens,  # Max response length
-                        }
-                    )
-                    
-                    # Step 4: Raise exception for HTTP error status codes (4xx, 5xx)
-                    response.raise_for_status()
-                    
-                    # Step 5: Parse JSON response and extract generated text
-                    data = response.json()
-                    return data.get("choices", [{}])[0].get("text", "").strip()
-                    
-            except httpx.HTTPStatusError as e:
-                # HTTP error (4xx, 5xx) - log details for debugging
-                last_error = e
-                print(f"HTTP error on attempt {attempt + 1}: {e.response.status_code} - {e.response.text}")
-                if attempt < self.max_retries - 1:
-                    # Wait before retrying (linear backoff: 1s, 2s, 3s)
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                    
-            except Exception as e:
-                # Catch-all for connection errors, timeouts, JSON parsing errors, etc.
-                last_error = e
-                print(f"Error on attempt {attempt + 1}: {type(e).__name__} - {str(e)}")
-                if attempt < self.max_retries - 1:
-                    # Wait before retrying
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
+        Sends the prompts as a list in one /completions call, which
+        OpenAI-compatible servers answer with one choice per prompt.
+        
+        Args:
+            prompts (List[Prompt]): Prompts to send to the local LLM
+        
+        Returns:
+            List[str]: Generated responses, in the same order as prompts
+        
+        Raises:
+            RuntimeError: If all retry attempts fail
+        """
+        return await self._complete(prompts, count=len(prompts))
+    
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        """
+        Stream text from the local LLM as it is generated.
+        
+        Sends the request with "stream": true and yields each chunk from the
+        Server-Sent Events response, cutting time-to-first-token to the
+        model's first decode step instead of the full generation.
+        
+        Args:
+            prompt (Prompt): Input text prompt (or mixed token/text prompt)
+        
+        Yields:
+            str: Text chunks in generation order
+        
+        Raises:
+            httpx.HTTPError: On connection or HTTP errors. Streams are not
+                retried, since part of the response may already be delivered.
+        """
+        async for text in self._stream_completion(prompt):
+            yield text
+    
+    async def tokenize(self, text: str) -> List[int]:
+        """
+        Tokenize text using the llama.cpp server's /tokenize endpoint.
+        
+        The endpoint lives at the server root, so a trailing /v1 is
+        stripped from the configured endpoint.
+        
+        Args:
+            text (str): Text to tokenize
         
-        # All retries exhausted - raise final error
-        raise RuntimeError(f"Local LLM generation failed after {self.max_retries} attempts: {str(last_error)}")
+        Returns:
+            List[int]: Token IDs
+        
+        Raises:
+            httpx.HTTPError: If the server is unreachable or has no /tokenize endpoint
+        """
+        base_url = self.endpoint.rstrip("/")
+        if base_url.endswith("/v1"):
+            base_url = base_url[:-3]
+        
+        response = await self._client.post(
+            f"{base_url}/tokenize", content=orjson.dumps({"content": text})
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)["tokens"]
     
     def validate_config(self) -> bool:
         """
@@ -292,6 +1179,18 @@ class APILLMAdapter(LLMAdapter):
             "max_tokens": 2000
         }
     
+    Chat Format (provider_family):
+        With provider_family set, every call uses the provider's chat API.
+        generate_with_prefix() sends the static prefix as the system message
+        and the dynamic part as the user message; generate() and
+        generate_stream() send the whole prompt as the user message, and
+        generate_batch() sends one request per prompt.
+        - "openai": POST to /chat/completions (derived from a /completions
+          endpoint); OpenAI caches long shared prefixes automatically
+        - "anthropic": POST to api_endpoint (the /v1/messages URL) with the
+          system block marked {"cache_control": {"type": "ephemeral"}};
+          authenticates with x-api-key instead of a Bearer token
+    
     Security:
         - Always use HTTPS endpoints in production
         - Store API tokens in environment variables, never hardcode
@@ -310,6 +1209,8 @@ class APILLMAdapter(LLMAdapter):
         ```
     """
     
+    _error_label = "API LLM"
+    
     def __init__(self, config: LLMConfig):
         """
         Initialize cloud API adapter with retry configuration.
@@ -318,10 +1219,44 @@ class APILLMAdapter(LLMAdapter):
             config (LLMConfig): Configuration with API endpoint, token, and timeout
         """
         super().__init__(config)
-        self.max_retries = 3  # Retry up to 3 times for transient failures
-        self.retry_delay = 1.0  # Linear backoff: 1s, 2s, 3s
+        
+        # Static request parts, built once (config is immutable)
+        self._base_payload = {
+            "model": config.model_name,  # e.g., "gpt-4", "claude-3"
+            "temperature": config.temperature,  # Controls randomness
+            "max_tokens": config.max_tokens,  # Max response length
+        }
+        self._completions_url = config.api_endpoint
+        
+        # Chat endpoint, used for every call when provider_family is set
+        self._chat_url = config.api_endpoint or ""
+        if (
+            config.provider_family == "openai"
+            and self._chat_url.endswith("/completions")
+            and not self._chat_url.endswith("/chat/completions")
+        ):
+            self._chat_url = self._chat_url[: -len("/completions")] + "/chat/completions"
+    
+    def _default_headers(self, config: LLMConfig) -> Dict[str, str]:
+        """
+        Build the static headers, using Anthropic's scheme when configured.
+        
+        Args:
+            config (LLMConfig): LLM configuration (api_token, provider_family)
+        
+        Returns:
+            Dict[str, str]: Header name -> value
+        """
+        if config.provider_family != "anthropic":
+            # Bearer token for API authentication (required by most providers)
+            return super()._default_headers(config)
+        # Anthropic authenticates with an API key header and pins the API version
+        headers = {"Content-Type": "application/json", "anthropic-version": "2023-06-01"}
+        if config.api_token:
+            headers["x-api-key"] = config.api_token
+        return headers
     
-    async def generate(self, prompt: str) -> str:
+    async def generate(self, prompt: Prompt) -> str:
         """
         Generate text from cloud API with automatic retry logic.
         
@@ -329,7 +1264,7 @@ class APILLMAdapter(LLMAdapter):
         like rate limits, temporary service outages, or network issues.
         
         Args:
-            prompt (str): Input text prompt to send to the cloud API
+            prompt (Prompt): Input text prompt (or mixed token/text prompt) to send to the cloud API
         
         Returns:
             str: Generated text response, stripped of leading/trailing whitespace
@@ -339,63 +1274,140 @@ class APILLMAdapter(LLMAdapter):
         
         Retry Behavior:
             - Attempt 1: Immediate
-            - Attempt 2: After 1 second delay
-            - Attempt 3: After 2 second delay
-            - Total max wait: 3 seconds across all retries
+            - Attempt 2: After ~1 second delay (plus up to 10% jitter)
+            - Attempt 3: After ~2 second delay (plus up to 10% jitter)
+            - 429/503: Waits at least the server's Retry-After seconds
         
         Error Handling:
             - HTTPStatusError: HTTP 4xx/5xx responses (e.g., 429 Rate Limit, 500 Server Error)
             - ConnectError: Cannot reach the API endpoint (network issues)
             - TimeoutError: Request exceeds configured timeout (default: 270s)
+            - Non-retryable errors (e.g., 401 invalid token) fail on the first attempt
         
         Production Note:
-            For production use, consider implementing more sophisticated retry logic:
-            - Exponential backoff with jitter
-            - Respect Retry-After headers for rate limits
-            - Circuit breaker pattern for repeated failures
+            For production use, consider adding a circuit breaker for
+            repeated failures on top of the backoff above.
         """
-        last_error = None
+        if self.config.provider_family in ("openai", "anthropic"):
+            return await self._cached_chat(None, prompt)
+        # Deterministic calls: serve byte-identical prompts from the cache
+        return await self._cached_completion(prompt)
+    
+    async def generate_with_prefix(self, static_prefix: str, dynamic: str) -> str:
+        """
+        Generate a response with the static prefix marked for provider caching.
         
-        # Retry loop: attempt up to max_retries times
-        for attempt in range(self.max_retries):
-            try:
-                # Step 1: Prepare authentication headers
-                headers = {}
-                if self.config.api_token:
-                    # Add Bearer token for API authentication (required by most providers)
-                    headers["Authorization"] = f"Bearer {self.config.api_token}"
-                
-                # Step 2: Create async HTTP client with configured timeout
-                async with httpx.AsyncClient(timeout=self.config.timeout_seconds) as client:
-                    # Step 3: Send POST request to cloud API endpoint
-                    response = await client.post(
-                        self.config.api_endpoint,
-                        headers=headers,
-                        json={
-                            "model": self.config.model_name,  # e.g., "gpt-4", "claude-3"
-                            "prompt": prompt,
-                            "temperature": self.config.temperature,  # Controls randomness
-                            "max_tokens": self.config.max_tokens,  # Max response length
-                        }
-                    )
-                    
-                    # Step 4: Raise exception for HTTP error status codes
-                    response.raise_for_status()
-                    
-                    # Step 5: Parse JSON response and extract generated text
-                    data = response.json()
-                    return data.get("choices", [{}])[0].get("text", "").strip()
-                    
-            except Exception as e:
-                # Catch all errors (HTTP, connection, timeout, JSON parsing, etc.)
-                last_error = e
-                if attempt < self.max_retries - 1:
-                    # Wait before retrying (linear backoff: 1s, 2s, 3s)
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
+        For provider_family "openai" or "anthropic" the prompt is sent in chat
+        format (static prefix as system message, dynamic part as user
+        message); otherwise this falls back to a plain completion of
+        static_prefix + dynamic.
         
-        # All retries exhausted - raise final error
-        raise RuntimeError(f"API LLM generation failed after {self.max_retries} attempts: {str(last_error)}")
+        Args:
+            static_prefix (str): Prompt text shared by every request
+            dynamic (str): Per-request prompt text
+        
+        Returns:
+            str: Generated text response, stripped of leading/trailing whitespace
+        
+        Raises:
+            RuntimeError: If all retry attempts fail
+        """
+        if self.config.provider_family not in ("openai", "anthropic"):
+            return await super().generate_with_prefix(static_prefix, dynamic)
+        return await self._cached_chat(static_prefix, dynamic)
+    
+    async def _cached_chat(self, system: Optional[str], user: Prompt) -> str:
+        """
+        Send one chat request, serving deterministic repeats from the cache.
+        
+        Args:
+            system (Optional[str]): System prompt (cacheable prefix), or None
+            user (Prompt): User message text
+        
+        Returns:
+            str: Generated text response, stripped of leading/trailing whitespace
+        
+        Raises:
+            RuntimeError: If all retry attempts fail
+        """
+        key = self._cache_key([system, user] if system is not None else user)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        response = _extract_chat_text(await self._post(self._chat_url, self._chat_payload(system, user)))
+        self._cache_put(key, response)
+        return response
+    
+    def _chat_payload(self, system: Optional[str], user: Prompt) -> Dict[str, Any]:
+        """
+        Build a chat request body in the configured provider_family's format.
+        
+        Args:
+            system (Optional[str]): System prompt, or None for a user message only
+            user (Prompt): User message text
+        
+        Returns:
+            Dict[str, Any]: Request body
+        """
+        messages = [{"role": "user", "content": user}]
+        if system is None:
+            return {**self._base_payload, "messages": messages}
+        if self.config.provider_family == "anthropic":
+            return {
+                **self._base_payload,
+                "system": [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+                "messages": messages,
+            }
+        return {**self._base_payload, "messages": [{"role": "system", "content": system}, *messages]}
+    
+    async def generate_batch(self, prompts: List[Prompt]) -> List[str]:
+        """
+        Generate responses for several prompts in a single request.
+        
+        Args:
+            prompts (List[Prompt]): Prompts to send to the cloud API
+        
+        Returns:
+            List[str]: Generated responses, in the same order as prompts
+        
+        Raises:
+            RuntimeError: If all retry attempts fail
+        """
+        if self.config.provider_family in ("openai", "anthropic"):
+            # Chat APIs take one conversation per request
+            return await super().generate_batch(prompts)
+        return await self._complete(prompts, count=len(prompts))
+    
+    async def generate_stream(self, prompt: Prompt) -> AsyncIterator[str]:
+        """
+        Stream text from the cloud API as it is generated.
+        
+        Args:
+            prompt (Prompt): Input text prompt
+        
+        Yields:
+            str: Text chunks in generation order
+        
+        Raises:
+            httpx.HTTPError: On connection or HTTP errors. Streams are not
+                retried, since part of the response may already be delivered.
+        """
+        if self.config.provider_family not in ("openai", "anthropic"):
+            async for text in self._stream_completion(prompt):
+                yield text
+            return
+        
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        async with self._client.stream(
+            "POST",
+            self._chat_url,
+            content=orjson.dumps({**self._chat_payload(None, prompt), "stream": True}),
+        ) as response:
+            response.raise_for_status()
+            async for text in _iter_stream_texts(response):
+                yield text
     
     def validate_config(self) -> bool:
         """
@@ -417,6 +1429,13 @@ class APILLMAdapter(LLMAdapter):
 # FACTORY PATTERN FOR ADAPTER CREATION
 # ============================================================================
 
+# Provider name -> adapter class, built once at import time
+_ADAPTERS: Dict[str, Type[LLMAdapter]] = {
+    "local": LocalLLMAdapter,
+    "api": APILLMAdapter,
+}
+
+
 class LLMAdapterFactory:
     """
     Factory for Creating LLM Adapters
@@ -430,7 +1449,8 @@ class LLMAdapterFactory:
     
     Design Benefits:
         - Single point of adapter creation
-        - Easy to add new providers (just add new case)
+        - Easy to add new providers (add an entry to _ADAPTERS, or call
+          register() from another module without editing this one)
         - Client code doesn't need to know about concrete adapter classes
         - Validates provider type at creation time
     
@@ -443,6 +1463,26 @@ class LLMAdapterFactory:
         ```
     """
     
+    @staticmethod
+    def register(provider: str, adapter_class: Type[LLMAdapter]) -> None:
+        """
+        Register an adapter class for a provider name.
+        
+        Lets third-party adapters plug into create_adapter() without
+        modifying this module. Re-registering a name replaces the class.
+        
+        Args:
+            provider (str): Value of LLMConfig.provider that selects the adapter
+            adapter_class (Type[LLMAdapter]): Adapter class to instantiate
+        
+        Example:
+            ```python
+            LLMAdapterFactory.register("ollama", OllamaAdapter)
+            adapter = LLMAdapterFactory.create_adapter(LLMConfig(provider="ollama", ...))
+            ```
+        """
+        _ADAPTERS[provider] = adapter_class
+    
     @staticmethod
     def create_adapter(config: LLMConfig) -> LLMAdapter:
         """
@@ -468,10 +1508,9 @@ class LLMAdapterFactory:
             # Returns LocalLLMAdapter instance
             ```
         """
-        if config.provider == "local":
-            return LocalLLMAdapter(config)
-        elif config.provider == "api":
-            return APILLMAdapter(config)
-        else:
+        # Single dict lookup instead of a chain of string comparisons
+        adapter_class = _ADAPTERS.get(config.provider)
+        if adapter_class is None:
             # Unknown provider - fail fast with clear error message
             raise ValueError(f"Unknown LLM provider: {config.provider}")
+        return adapter_class(config)
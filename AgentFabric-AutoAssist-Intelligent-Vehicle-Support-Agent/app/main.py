@@ -6,6 +6,8 @@ It provides RESTful endpoints for vehicle support queries with full observabilit
 
 Endpoints:
     - POST /chat: Process vehicle support queries through LLM
+    - POST /chat/batch: Process several queries with shared LLM calls
+    - POST /chat/stream: Stream the response text as it is generated
     - GET /health: Health check for container orchestration
     - GET /metrics: JSON-formatted metrics for monitoring
     - GET /metrics/prometheus: Prometheus-compatible metrics endpoint
@@ -21,17 +23,25 @@ Author: Babu Srinivasan
 Project: AgentFabric AutoAssist
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+from typing_extensions import Annotated
+import asyncio
 import logging
 import json
+import msgspec
+import orjson
+import re
+import string
 import time
 
 from app.config import AppConfig, config
-from app.agent import AutoAssistAgent
+from app.agent import AutoAssistAgent, MAX_QUERIES_PER_PROMPT
 from app.observability import setup_logging, metrics
 
 
@@ -42,6 +52,49 @@ from app.observability import setup_logging, metrics
 # Setup structured logging with JSON format
 logger = setup_logging(config.app_name, config.log_level)
 
+# ============================================================================
+# AGENT INITIALIZATION
+# ============================================================================
+
+# Initialize the AutoAssist agent with configuration
+# This handles LLM communication and prompt management
+agent = AutoAssistAgent(config)
+
+
+# ============================================================================
+# LIFECYCLE (LIFESPAN)
+# ============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+    
+    On startup, validates configuration and pre-opens the LLM connection
+    before accepting any requests. Fails fast if configuration is invalid.
+    On shutdown, closes the agent's pooled LLM connections.
+    
+    Raises:
+        RuntimeError: If agent configuration validation fails
+    """
+    logger.info("Starting %s service", config.app_name)
+    if not agent.validate_config():
+        logger.error("Agent configuration validation failed")
+        raise RuntimeError("Invalid agent configuration")
+    logger.info("Agent configuration validated successfully")
+    # Pay DNS + TCP + TLS setup now instead of on the first /chat request
+    await agent.warmup()
+    
+    yield
+    
+    await agent.aclose()
+    logger.info("%s service stopped", config.app_name)
+
+
+# ============================================================================
+# FASTAPI APPLICATION
+# ============================================================================
+
 # Initialize FastAPI application with metadata
 app = FastAPI(
     title=config.app_name,
@@ -49,19 +102,14 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc UI
+    lifespan=lifespan,  # Startup validation/warmup and shutdown cleanup
+    default_response_class=ORJSONResponse,  # Serialize responses with orjson
 )
 
 # ============================================================================
 # SECURITY: CORS MIDDLEWARE CONFIGURATION
 # ============================================================================
-# PRODUCTION NOTE: Remove "*" and add only trusted domains
-# Example: ["https://yourdomain.com", "https://app.yourdomain.com"]
-
-# Add CORS middleware - PRODUCTION: Restrict origins
-# ============================================================================
-# SECURITY: CORS MIDDLEWARE CONFIGURATION
-# ============================================================================
-# PRODUCTION NOTE: Remove "*" and add only trusted domains
+# PRODUCTION NOTE: Never use "*" - add only trusted domains
 # Example: ["https://yourdomain.com", "https://app.yourdomain.com"]
 
 app.add_middleware(
@@ -74,21 +122,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],  # Restrict to only needed methods
     allow_headers=["Content-Type", "Authorization"],  # Restrict headers
-    max_age=600,  # Cache preflight requests for 10 minutes
+    max_age=7200,  # Cache preflight requests for 2 hours (Chromium's upper limit)
 )
 
 # ============================================================================
-# AGENT INITIALIZATION
+# REQUEST/RESPONSE MODELS (Pydantic Schemas)
 # ============================================================================
 
-# Initialize the AutoAssist agent with configuration
-# This handles LLM communication and prompt management
-agent = AutoAssistAgent(config)
+# Query validation shared by single and batch chat requests, compiled once
+# at import time and applied with fullmatch() by the field validators below
+_QUERY_RE = re.compile(r'[\w\s\?\.\,\!\-\'\"\(\)]+')  # Alphanumeric + basic punctuation only
+_SESSION_RE = re.compile(r'[a-zA-Z0-9\-_]+')  # Alphanumeric, hyphens, underscores only
+# ASCII subset of _QUERY_RE, deleted in a single str.translate() pass
+_QUERY_ASCII_STRIP = str.maketrans("", "", string.ascii_letters + string.digits + "_" + " \t\n\r\f\v" + "?.,!-'\"()")
+MAX_BATCH_QUERIES = 2 * MAX_QUERIES_PER_PROMPT
 
+# Prometheus exposition body, re-rendered at most once per TTL
+PROMETHEUS_CACHE_TTL_SECONDS = 1.0
+_prometheus_cache = {"rendered_at": float("-inf"), "body": b""}
+
+
+def _check_query(query: str) -> str:
+    """Reject queries containing characters outside the allowed set."""
+    # Allowed ASCII characters are stripped at C speed; only what is left
+    # (non-ASCII letters or disallowed characters) goes through the regex
+    leftover = query.translate(_QUERY_ASCII_STRIP)
+    if leftover and not _QUERY_RE.fullmatch(leftover):
+        raise ValueError("Query contains invalid characters")
+    return query
+
+
+def _check_session_id(session_id: Optional[str]) -> Optional[str]:
+    """Reject session IDs containing characters outside the allowed set."""
+    if session_id is not None and not _SESSION_RE.fullmatch(session_id):
+        raise ValueError("Session ID contains invalid characters")
+    return session_id
 
-# ============================================================================
-# REQUEST/RESPONSE MODELS (Pydantic Schemas)
-# ============================================================================
 
 class ChatRequest(BaseModel):
     """
@@ -96,7 +165,8 @@ class ChatRequest(BaseModel):
     
     Attributes:
         query: User's vehicle support question (1-1000 chars)
-        session_id: Optional session identifier for tracking (max 100 chars)
+        session_id: Optional session identifier for tracking and, with
+            PREFETCH_FOLLOWUPS, answering its follow-up questions (max 100 chars)
     
     Security:
         - Regex validation prevents injection attacks
@@ -106,15 +176,55 @@ class ChatRequest(BaseModel):
         ..., 
         min_length=1, 
         max_length=1000, 
-        description="User query",
-        pattern=r'^[\w\s\?\.\,\!\-\'\"\(\)]+$'  # Alphanumeric + basic punctuation only
+        description="User query"
     )
     session_id: Optional[str] = Field(
         None, 
-        description="Optional session ID for tracking",
-        max_length=100,
-        pattern=r'^[a-zA-Z0-9\-_]+$'  # Alphanumeric, hyphens, underscores only
+        description="Optional session ID for tracking and follow-up prefetch",
+        max_length=100
     )
+    
+    _validate_query = field_validator("query")(_check_query)
+    _validate_session_id = field_validator("session_id")(_check_session_id)
+
+
+class ChatPayload(msgspec.Struct):
+    """
+    msgspec mirror of ChatRequest used on the /chat hot path.
+    
+    msgspec decodes and type/length-checks the raw body in C in a single
+    pass; _decode_chat_request() then applies the same character checks
+    as ChatRequest. ChatRequest remains the documented OpenAPI schema.
+    """
+    query: Annotated[str, msgspec.Meta(min_length=1, max_length=1000)]
+    session_id: Optional[Annotated[str, msgspec.Meta(max_length=100)]] = None
+
+
+_CHAT_DECODER = msgspec.json.Decoder(ChatPayload)
+
+# Request body schema advertised for routes that decode ChatPayload themselves
+_CHAT_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": ChatRequest.model_json_schema()}},
+    }
+}
+
+
+def _decode_chat_request(body: bytes) -> ChatPayload:
+    """
+    Decode and validate a ChatRequest JSON body.
+    
+    Raises:
+        HTTPException: 422 if the body is malformed or fails validation
+    """
+    try:
+        request = _CHAT_DECODER.decode(body)
+        _check_query(request.query)
+        _check_session_id(request.session_id)
+    except (msgspec.DecodeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return request
 
 
 class ChatResponse(BaseModel):
@@ -127,12 +237,58 @@ class ChatResponse(BaseModel):
         response: LLM-generated response (if successful)
         error: Error message (if failed)
         model: Name of the LLM model used
+        cached: Whether the response was served from the response cache
     """
     status: str = Field(..., description="Response status (success/error)")
     query: str = Field(..., description="Original user query")
     response: Optional[str] = Field(None, description="Agent response")
     error: Optional[str] = Field(None, description="Error message if status is error")
     model: str = Field(..., description="LLM model used")
+    cached: bool = Field(False, description="True if served from the response cache")
+
+
+class ChatBatchRequest(BaseModel):
+    """
+    Batch chat request schema.
+    
+    Attributes:
+        queries: Vehicle support questions (1-16 items, each 1-1000 chars)
+        session_id: Optional session identifier for tracking (max 100 chars)
+    
+    Security:
+        - Each query uses the same regex and length limits as ChatRequest
+        - Batch size limit prevents DoS attacks
+    """
+    queries: List[Annotated[str, Field(min_length=1, max_length=1000)]] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_QUERIES,
+        description="User queries"
+    )
+    session_id: Optional[str] = Field(
+        None, 
+        description="Optional session ID for tracking",
+        max_length=100
+    )
+    
+    _validate_session_id = field_validator("session_id")(_check_session_id)
+    
+    @field_validator("queries")
+    @classmethod
+    def _validate_queries(cls, queries: List[str]) -> List[str]:
+        for query in queries:
+            _check_query(query)
+        return queries
+
+
+class ChatBatchResponse(BaseModel):
+    """
+    Batch chat response schema.
+    
+    Attributes:
+        results: One ChatResponse per query, in request order
+    """
+    results: List[ChatResponse] = Field(..., description="Per-query results")
 
 
 class HealthResponse(BaseModel):
@@ -148,25 +304,30 @@ class HealthResponse(BaseModel):
 
 
 # ============================================================================
-# LIFECYCLE EVENTS
+# STATIC RESPONSE BODIES
 # ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """
-    Application startup event handler.
-    
-    Validates configuration and initializes resources before
-    accepting any requests. Fails fast if configuration is invalid.
-    
-    Raises:
-        RuntimeError: If agent configuration validation fails
-    """
-    logger.info(f"Starting {config.app_name} service")
-    if not agent.validate_config():
-        logger.error("Agent configuration validation failed")
-        raise RuntimeError("Invalid agent configuration")
-    logger.info("Agent configuration validated successfully")
+# /health and / never change while the process runs, so their JSON is
+# encoded once here instead of on every probe
+
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": config.app_name,
+    "version": "0.1.0"
+})
+
+_ROOT_BODY = orjson.dumps({
+    "service": config.app_name,
+    "status": "running",
+    "endpoints": [
+        "/health - Health check",
+        "/chat - Chat endpoint (POST)",
+        "/chat/batch - Batch chat endpoint (POST)",
+        "/chat/stream - Streaming chat endpoint (POST)",
+        "/metrics - Metrics endpoint (JSON)",
+        "/metrics/prometheus - Prometheus-format metrics",
+        "/docs - API documentation"
+    ]
+})
 
 
 # ============================================================================
@@ -179,20 +340,21 @@ async def health_check():
     Health check endpoint for container orchestration.
     
     Returns:
-        HealthResponse: Service health status
+        Response: Pre-encoded HealthResponse JSON
         
     Status Codes:
         200: Service is healthy and ready
     """
-    return HealthResponse(
-        status="healthy",
-        service=config.app_name,
-        version="0.1.0"
-    )
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+@app.post(
+    "/chat",
+    response_model=None,  # Result dict is returned as-is; no response re-validation
+    responses={200: {"model": ChatResponse}},  # Keeps the schema in the API docs
+    openapi_extra=_CHAT_REQUEST_OPENAPI,
+)
+async def chat(raw_request: Request):
     """
     Process vehicle support queries through LLM.
     
@@ -200,8 +362,12 @@ async def chat(request: ChatRequest):
     and troubleshooting. It includes retry logic, timeout handling, and
     comprehensive error handling.
     
+    Concurrent requests are micro-batched: with MAX_BATCH_SIZE > 1 the
+    agent's LLM calls go through LLMAdapter.submit(), which coalesces
+    prompts arriving within BATCH_WAIT_MS into one completion request.
+    
     Args:
-        request: ChatRequest with user query and optional session_id
+        raw_request: HTTP request whose JSON body matches ChatRequest
         
     Returns:
         ChatResponse: LLM-generated response or error details
@@ -209,7 +375,9 @@ async def chat(request: ChatRequest):
     Status Codes:
         200: Successful response
         400: Invalid request format
+        422: Body failed schema validation
         500: Internal server error or LLM failure
+        504: Query exceeded REQUEST_TIMEOUT_SECONDS
         
     Security:
         - Input validation with regex patterns
@@ -217,48 +385,187 @@ async def chat(request: ChatRequest):
         - Error message sanitization (no internal details exposed)
         - Request tracking with latency metrics
     """
-    start_time = time.time()
+    request = _decode_chat_request(await raw_request.body())
+    start_ns = time.perf_counter_ns()
+    error = True  # Cleared only once a successful response is ready
+    cached = False
     
     try:
         # Sanitize input - remove any potential injection attempts
         sanitized_query = request.query.strip()
         
-        logger.info(f"Chat request received: {sanitized_query[:50]}...")
-        
-        # Process query through agent (includes retry logic)
-        result = await agent.process_query(sanitized_query)
+        # Lazy %-style args: nothing is formatted unless INFO is enabled
+        logger.info("Chat request received: %.50s...", sanitized_query)
         
-        # Calculate latency for monitoring
-        latency_ms = (time.time() - start_time) * 1000
-        
-        # Record metrics for Prometheus/Grafana
-        metrics.record_request(
-            latency_ms=latency_ms,
-            error=(result.get("status") == "error")
-        )
+        # Process query through agent (includes retry logic), capped end to
+        # end so a stuck backend can't hold the request open indefinitely
+        try:
+            result = await asyncio.wait_for(
+                agent.process_query(sanitized_query, request.session_id),
+                timeout=config.request_timeout_seconds or None,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Chat request timed out after %ss", config.request_timeout_seconds)
+            raise HTTPException(status_code=504, detail="Upstream LLM timeout")
         
         if result["status"] == "error":
-            logger.warning(f"Agent returned error: {result.get('error')} (latency: {latency_ms:.2f}ms)")
+            logger.warning("Agent returned error: %s", result.get("error"))
             # Don't expose internal error details to client
             raise HTTPException(
                 status_code=500,
                 detail="Failed to process query. Please try again."
             )
         
-        logger.info(f"Chat request processed successfully (latency: {latency_ms:.2f}ms)")
-        return ChatResponse(**result)
+        error = False
+        cached = result.get("cached", False)
+        # Serialize the agent's result dict directly with orjson instead of
+        # building a ChatResponse model and re-encoding it
+        return ORJSONResponse(content=result)
         
     except HTTPException:
         raise
-    except ValueError as e:
-        latency_ms = (time.time() - start_time) * 1000
-        metrics.record_request(latency_ms=latency_ms, error=True)
-        logger.error(f"Validation error: {str(e)}")
+    except ValueError:
+        logger.warning("Validation error", exc_info=True)
+        raise HTTPException(status_code=400, detail="Invalid request format")
+    except Exception:
+        logger.exception("Unexpected error in /chat")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        # Record metrics for Prometheus/Grafana exactly once, on every path
+        latency_us = (time.perf_counter_ns() - start_ns) // 1000
+        metrics.record_request_us(latency_us, error, cached)
+        if error:
+            logger.warning("Chat request failed (latency: %dus)", latency_us)
+        else:
+            logger.info("Chat request processed successfully (latency: %dus)", latency_us)
+
+
+@app.post("/chat/stream", openapi_extra=_CHAT_REQUEST_OPENAPI)
+async def chat_stream(raw_request: Request):
+    """
+    Process a vehicle support query and stream the response text.
+    
+    The response body is plain text delivered chunk by chunk as the LLM
+    generates it, so clients can render the answer immediately instead of
+    waiting for the full completion.
+    
+    Args:
+        raw_request: HTTP request whose JSON body matches ChatRequest
+        
+    Returns:
+        StreamingResponse: text/plain response streamed in chunks
+        
+    Status Codes:
+        200: Streaming response (a stream cut short indicates a mid-stream failure)
+        400: Invalid request format
+        422: Body failed schema validation
+        500: Internal server error or LLM failure before the first chunk
+        504: No response from the LLM within its timeout
+    """
+    request = _decode_chat_request(await raw_request.body())
+    start_ns = time.perf_counter_ns()
+    
+    # Sanitize input - remove any potential injection attempts
+    sanitized_query = request.query.strip()
+    logger.info("Streaming chat request received: %.50s...", sanitized_query)
+    
+    # Pull the first chunk before responding, so validation and connection
+    # errors still map to proper HTTP status codes
+    stream = agent.process_query_stream(sanitized_query, request.session_id)
+    try:
+        first_chunk = await anext(stream)
+    except asyncio.TimeoutError:
+        metrics.record_request_us((time.perf_counter_ns() - start_ns) // 1000, error=True)
+        logger.warning("Streaming chat request timed out before the first chunk")
+        raise HTTPException(status_code=504, detail="Upstream LLM timeout")
+    except ValueError:
+        metrics.record_request_us((time.perf_counter_ns() - start_ns) // 1000, error=True)
+        logger.warning("Validation error", exc_info=True)
         raise HTTPException(status_code=400, detail="Invalid request format")
-    except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
-        metrics.record_request(latency_ms=latency_ms, error=True)
-        logger.error(f"Unexpected error in /chat: {str(e)}", exc_info=True)
+    except Exception:
+        metrics.record_request_us((time.perf_counter_ns() - start_ns) // 1000, error=True)
+        logger.exception("Unexpected error in /chat/stream")
+        raise HTTPException(status_code=500, detail="Failed to process query. Please try again.")
+    
+    async def body():
+        error = False
+        try:
+            yield first_chunk
+            async for chunk in stream:
+                yield chunk
+        except Exception as e:
+            # Headers are already sent - end the stream and record the failure
+            error = True
+            logger.error("Stream interrupted in /chat/stream: %r", e)
+        finally:
+            # Also runs on client disconnect: stops the agent's LLM stream
+            await stream.aclose()
+            latency_us = (time.perf_counter_ns() - start_ns) // 1000
+            metrics.record_request_us(latency_us, error)
+            logger.info("Streaming chat request finished (latency: %dus)", latency_us)
+    
+    return StreamingResponse(body(), media_type="text/plain; charset=utf-8")
+
+
+@app.post(
+    "/chat/batch",
+    response_model=None,  # Result dicts are returned as-is; no response re-validation
+    responses={200: {"model": ChatBatchResponse}},  # Keeps the schema in the API docs
+)
+async def chat_batch(request: ChatBatchRequest):
+    """
+    Process several vehicle support queries in one call.
+    
+    Useful for API clients such as fleet tools that need answers for many
+    fault codes at once. Queries are packed into shared LLM calls by the
+    agent, so N queries cost far fewer than N round-trips.
+    
+    Args:
+        request: ChatBatchRequest with user queries and optional session_id
+        
+    Returns:
+        ChatBatchResponse: Per-query responses; failed queries carry a
+        sanitized error message instead of failing the whole batch
+        
+    Status Codes:
+        200: Batch processed (check each result's status)
+        400: Invalid request format
+        500: Internal server error
+    """
+    start_ns = time.perf_counter_ns()
+    
+    try:
+        # Sanitize input - remove any potential injection attempts
+        sanitized_queries = [query.strip() for query in request.queries]
+        
+        logger.info("Batch chat request received: %d queries", len(sanitized_queries))
+        
+        results = await agent.process_queries(sanitized_queries)
+        
+        latency_us = (time.perf_counter_ns() - start_ns) // 1000
+        has_error = any(result["status"] == "error" for result in results)
+        metrics.record_request_us(latency_us, has_error)
+        
+        responses = []
+        for result in results:
+            if result["status"] == "error":
+                logger.warning("Agent returned error in batch: %s", result.get("error"))
+                # Don't expose internal error details to client
+                result = {
+                    **result,
+                    "response": None,
+                    "error": "Failed to process query. Please try again.",
+                    "cached": False,
+                }
+            responses.append(result)
+        
+        logger.info("Batch chat request processed (latency: %dus)", latency_us)
+        # Agent results already match ChatResponse - serialize them directly
+        return {"results": responses}
+        
+    except Exception:
+        metrics.record_request_us((time.perf_counter_ns() - start_ns) // 1000, error=True)
+        logger.exception("Unexpected error in /chat/batch")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -268,20 +575,26 @@ async def metrics_endpoint():
     Metrics endpoint in JSON format.
     
     Returns current metrics including request count, error count,
-    average latency, and success rate.
+    average latency, success rate, and response cache hits.
     
     Returns:
-        JSONResponse: Metrics in JSON format
+        dict: Metrics, serialized by the default ORJSONResponse
         
     Example Response:
         {
             "total_requests": 42,
             "total_errors": 0,
             "avg_latency_ms": 25000.0,
-            "success_rate": 100.0
+            "success_rate": 100.0,
+            "cache_hits": 12,
+            "cache_hit_rate": 28.57,
+            "total_latency_ms": 1050000.0,
+            "p50_latency_ms": 21504.0,
+            "p95_latency_ms": 47104.0,
+            "p99_latency_ms": 59392.0
         }
     """
-    return JSONResponse(content=metrics.get_metrics())
+    return metrics.get_metrics()
 
 
 @app.get("/metrics/prometheus")
@@ -290,7 +603,9 @@ async def prometheus_metrics():
     Metrics endpoint in Prometheus text format.
     
     This endpoint is scraped by Prometheus every 15 seconds
-    (configured in observability/prometheus.yml).
+    (configured in observability/prometheus.yml). The rendered body is
+    reused for PROMETHEUS_CACHE_TTL_SECONDS, so concurrent scrapers cost
+    one formatting pass instead of one each.
     
     Returns:
         PlainTextResponse: Metrics in Prometheus exposition format
@@ -300,8 +615,11 @@ async def prometheus_metrics():
         # TYPE autoassist_requests_total counter
         autoassist_requests_total 42
     """
-    from fastapi.responses import PlainTextResponse
-    return PlainTextResponse(content=metrics.get_prometheus_format(), media_type="text/plain")
+    now = time.monotonic()
+    if now - _prometheus_cache["rendered_at"] >= PROMETHEUS_CACHE_TTL_SECONDS:
+        _prometheus_cache["body"] = metrics.get_prometheus_format().encode()
+        _prometheus_cache["rendered_at"] = now
+    return PlainTextResponse(content=_prometheus_cache["body"], media_type="text/plain; version=0.0.4")
 
 
 @app.get("/")
@@ -313,30 +631,29 @@ async def root():
     Useful for API discovery and health checks.
     
     Returns:
-        dict: Service information and endpoint list
+        Response: Pre-encoded service information and endpoint list
     """
-    return {
-        "service": config.app_name,
-        "status": "running",
-        "endpoints": [
-            "/health - Health check",
-            "/chat - Chat endpoint (POST)",
-            "/metrics - Metrics endpoint (JSON)",
-            "/metrics/prometheus - Prometheus-format metrics",
-            "/docs - API documentation"
-        ]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # ============================================================================
 # APPLICATION ENTRY POINT
 # ============================================================================
+# Single-process server for local development. The container runs the app
+# under Gunicorn with a single Uvicorn worker (see Dockerfile): the agent,
+# caches, rate limiter and metrics live in each worker process, so more
+# workers per container would split them. Scale out with containers.
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         app,
         host="0.0.0.0",  # Listen on all interfaces
         port=8000,
+        # Require the fast event loop and HTTP parser from requirements.txt
+        # instead of silently falling back to asyncio/h11 (no uvloop on Windows)
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
         log_config=None  # Use our custom logging configuration
     )
@@ -8,10 +8,12 @@ application, including structured JSON logging and Prometheus-compatible metrics
 Components:
     - JSONFormatter: Formats logs as structured JSON for easy parsing
     - RequestTracker: Decorator for automatic request tracking and timing
+    - fast_log: Opt-in JSON-line writer that bypasses logging (hot paths)
     - MetricsCollector: Collects and exposes metrics in Prometheus format
 
 Key Features:
     - Structured JSON logging with ISO timestamps
+    - Non-blocking logging: records are queued and written by a background thread
     - Automatic request ID generation for distributed tracing
     - Latency tracking for performance monitoring
     - Prometheus-compatible metrics endpoint
@@ -23,9 +25,13 @@ Metrics Exposed:
     - autoassist_errors_total: Total number of errors (counter)
     - autoassist_request_latency_ms: Average request latency (gauge)
     - autoassist_success_rate: Success rate percentage (gauge)
+    - autoassist_cache_hits_total: Requests answered from the response cache (counter)
+    - autoassist_request_duration_ms: p50/p95/p99 request latency (summary)
 
 Integration:
     - Logs are written to stdout in JSON format (Docker-friendly)
+    - JSON formatting and the stdout write happen on a listener thread,
+      off the asyncio event loop
     - Metrics are exposed via /metrics/prometheus endpoint
     - Prometheus scrapes metrics every 15 seconds
     - Grafana visualizes metrics via pre-configured dashboards
@@ -60,14 +66,21 @@ Author: AutoAssist Development Team
 License: MIT
 """
 
-import json
+import atexit
 import logging
+import queue
+import random
+import sys
+import threading
 import time
-import uuid
 from typing import Any, Callable, Optional
 from functools import wraps
-from datetime import datetime
-from collections import defaultdict
+from array import array
+from json.encoder import encode_basestring_ascii
+from collections import defaultdict, deque
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
 
 
 # ============================================================================
@@ -87,7 +100,7 @@ class JSONFormatter(logging.Formatter):
             "logger": "AutoAssist",                      # Logger name
             "message": "Request completed",              # Log message
             "module": "main",                            # Python module
-            "request_id": "uuid-here",                   # Optional: Request ID
+            "request_id": "9f3c2a7d41e0b856",            # Optional: Request ID
             "latency_ms": 123.45,                        # Optional: Latency
             "exception": "Traceback..."                  # Optional: Exception
         }
@@ -116,6 +129,36 @@ class JSONFormatter(logging.Formatter):
         ```
     """
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, "YYYY-MM-DDTHH:MM:SS" for it) - records logged within
+        # the same second reuse the formatted date/time and only append the
+        # fraction. One tuple, so a concurrent reader never sees a torn pair.
+        self._second_cache = (None, "")
+        # (microsecond, full timestamp) of the last record - bursts of records
+        # created in the same microsecond share one string
+        self._timestamp_cache = (None, "")
+        # (levelno, logger name, module) -> pre-serialized JSON around the
+        # message. These fields repeat on almost every record, so they are
+        # escaped once instead of per record.
+        self._field_cache = {}
+    
+    def _format_timestamp(self, created: float) -> str:
+        """Format a record's creation time as ISO 8601 UTC with microseconds."""
+        microsecond = int(created * 1_000_000)
+        cached_microsecond, timestamp = self._timestamp_cache
+        if microsecond == cached_microsecond:
+            return timestamp
+        
+        second, fraction = divmod(microsecond, 1_000_000)
+        cached_second, prefix = self._second_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_cache = (second, prefix)
+        timestamp = f"{prefix}.{fraction:06d}"
+        self._timestamp_cache = (microsecond, timestamp)
+        return timestamp
+    
     def format(self, record: logging.LogRecord) -> str:
         """
         Format log record as JSON string.
@@ -131,29 +174,154 @@ class JSONFormatter(logging.Formatter):
             - latency_ms: Request processing time in milliseconds
             - Any other attributes added via extra={} parameter
         """
-        # Step 1: Build base log structure with standard fields
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),  # ISO 8601 format
-            "level": record.levelname,                    # INFO, WARNING, ERROR, etc.
-            "logger": record.name,                        # Logger name (e.g., "AutoAssist")
-            "message": record.getMessage(),               # Formatted log message
-            "module": record.module,                      # Python module name
-        }
+        # The schema is fixed, so the JSON is assembled from string pieces
+        # rather than building a dict and serializing it on every record
+        
+        # Step 1: Look up the pre-serialized standard fields
+        # (level: INFO, WARNING, ...; logger: e.g. "AutoAssist"; module: Python module name)
+        key = (record.levelno, record.name, record.module)
+        cached = self._field_cache.get(key)
+        if cached is None:
+            cached = self._field_cache[key] = (
+                '","level":%s,"logger":%s,"message":' % (
+                    encode_basestring_ascii(record.levelname),
+                    encode_basestring_ascii(record.name),
+                ),
+                ',"module":%s' % encode_basestring_ascii(record.module),
+            )
+        before_message, after_message = cached
+        
+        parts = [
+            '{"timestamp":"',
+            self._format_timestamp(record.created),       # ISO 8601 UTC
+            before_message,
+            encode_basestring_ascii(record.getMessage()),  # Formatted log message
+            after_message,
+        ]
         
         # Step 2: Add exception traceback if present
         if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+            parts.append(',"exception":')
+            parts.append(encode_basestring_ascii(self.formatException(record.exc_info)))
         
         # Step 3: Add custom request_id field if present (for distributed tracing)
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
+        # (extra={} fields live in the record's __dict__; a dict get is cheaper than hasattr.
+        # They can be any JSON-serializable type, so orjson encodes them.)
+        fields = record.__dict__
+        request_id = fields.get("request_id")
+        if request_id is not None:
+            parts.append(',"request_id":')
+            parts.append(orjson.dumps(request_id).decode())
         
         # Step 4: Add custom latency_ms field if present (for performance monitoring)
-        if hasattr(record, "latency_ms"):
-            log_data["latency_ms"] = record.latency_ms
+        latency_ms = fields.get("latency_ms")
+        if latency_ms is not None:
+            parts.append(',"latency_ms":')
+            parts.append(orjson.dumps(latency_ms).decode())
         
-        # Step 5: Serialize to JSON (single line for easy log parsing)
-        return json.dumps(log_data)
+        # Step 5: Close the object (single line for easy log parsing)
+        parts.append("}")
+        return "".join(parts)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue.
+    
+    The stock prepare() pre-formats each record and strips exc_info so it
+    can be pickled for another process. Records here never leave the
+    process, so only the message is merged with its args (cheap, and it
+    freezes mutable args) and exc_info is kept for JSONFormatter to
+    render on the listener thread.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Max formatted records held by _BatchingStreamHandler before a forced write
+_LOG_BATCH_CAPACITY = 256
+
+
+class _BatchingStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that writes records in batches.
+    
+    The stock StreamHandler does a write() and flush() per record - one
+    syscall per log line. This handler buffers formatted lines and writes
+    them with a single write() when the batch is full or flush() is
+    called. _BatchingQueueListener calls flush() whenever the log queue
+    runs dry, so lines are never held back while the service is idle.
+    """
+    
+    def __init__(self, stream=None, capacity: int = _LOG_BATCH_CAPACITY):
+        super().__init__(stream)
+        self.capacity = capacity
+        self._batch = []
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._batch.append(self.format(record) + self.terminator)
+            if len(self._batch) >= self.capacity:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def emit_fields(self, fields: dict) -> None:
+        """Buffer a fast_log() record (JSONFormatter fields, epoch-seconds timestamp)."""
+        self.acquire()
+        try:
+            fields["timestamp"] = self.formatter._format_timestamp(fields["timestamp"])
+            self._batch.append(orjson.dumps(fields).decode() + self.terminator)
+            if len(self._batch) >= self.capacity:
+                self.flush()
+        finally:
+            self.release()
+    
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._batch:
+                lines, self._batch = "".join(self._batch), []
+                self.stream.write(lines)
+            super().flush()
+        finally:
+            self.release()
+
+
+class _BatchingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers whenever the queue is empty.
+    
+    Under load, records arriving back to back are batched by the handler;
+    as soon as the listener would block waiting for more, everything
+    buffered so far is written out. fast_log() records (plain dicts) share
+    the queue, so they are written in order with the logging records.
+    """
+    
+    def handle(self, record) -> None:
+        if isinstance(record, dict):
+            for handler in self.handlers:
+                handler.emit_fields(record)
+            return
+        super().handle(record)
+    
+    def dequeue(self, block: bool):
+        try:
+            return self.queue.get(block=False)
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+    
+    def stop(self) -> None:
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
 
 
 def setup_logging(app_name: str = "AutoAssist", log_level: str = "INFO"):
@@ -163,6 +331,13 @@ def setup_logging(app_name: str = "AutoAssist", log_level: str = "INFO"):
     Configures a logger with JSON formatting that writes to stdout.
     This is Docker-friendly and works well with container orchestration.
     
+    Logging calls only enqueue the record (QueueHandler); a single
+    QueueListener thread formats it and writes to stdout, so request
+    handlers on the event loop never block on log I/O. Module loggers
+    under the app package (logging.getLogger(__name__)) share the same
+    queue. The listener is stopped (and the queue flushed) at interpreter
+    exit.
+    
     Args:
         app_name (str): Name of the application (used as logger name)
         log_level (str): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -195,18 +370,100 @@ def setup_logging(app_name: str = "AutoAssist", log_level: str = "INFO"):
     # Step 2: Set minimum log level (messages below this level are ignored)
     logger.setLevel(getattr(logging, log_level))
     
+    # Already set up (e.g. the app module was imported twice) - reuse the
+    # existing pipeline instead of adding a second listener thread
+    if any(isinstance(h, _InProcessQueueHandler) for h in logger.handlers):
+        return logger
+    
     # Step 3: Create handler that writes to stdout (Docker-friendly)
-    handler = logging.StreamHandler()
+    # (batched: one write() per burst of records instead of one per record)
+    global _log_queue
+    handler = _BatchingStreamHandler(sys.stdout)
     
     # Step 4: Attach JSON formatter to handler
     handler.setFormatter(JSONFormatter())
     
-    # Step 5: Attach handler to logger
-    logger.addHandler(handler)
+    # Step 5: Run the stdout handler on a background listener thread
+    log_queue = queue.SimpleQueue()
+    listener = _BatchingQueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on shutdown
+    
+    # Step 6: Attach the (non-blocking) queue handler to the logger
+    queue_handler = _InProcessQueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    _log_queue = log_queue  # fast_log() records share the queue
+    
+    # Step 7: Route the package's module loggers (app.agent, app.llm_adapter)
+    # through the same queue; without a handler of their own, their warnings
+    # fall through to logging's last-resort handler, a blocking stderr write.
+    # They also need the configured level: unset, they inherit the root
+    # logger's WARNING and their INFO/DEBUG lines are dropped.
+    package_logger = logging.getLogger(__name__.partition(".")[0])
+    if package_logger is not logger and not any(
+        isinstance(h, _InProcessQueueHandler) for h in package_logger.handlers
+    ):
+        package_logger.setLevel(getattr(logging, log_level))
+        package_logger.addHandler(queue_handler)
     
     return logger
 
 
+# Log queue installed by setup_logging(); fast_log() records go onto it too
+_log_queue: Optional[queue.SimpleQueue] = None
+
+# Serializes fast_log() writes when logging is not set up
+_fast_log_lock = threading.Lock()
+
+# Formats fast_log() lines when logging is not set up
+_fast_log_formatter = JSONFormatter()
+
+
+def fast_log(logger_name: str, message: str, module: str, level: str = "INFO", **fields) -> None:
+    """
+    Log one structured line, bypassing the logging machinery.
+    
+    Skips level checks, filters, handler dispatch and LogRecord
+    construction for hot paths that only need a structured line in the
+    container log. The caller only builds a dict and puts it on the queue
+    set up by setup_logging(); the listener thread formats it with the
+    JSONFormatter schema (timestamp, level, logger, message, module, then
+    the extra fields) and writes it in order with the other records.
+    Before setup_logging() runs, the line is written to stdout directly.
+    
+    Args:
+        logger_name (str): Logger name for the "logger" field
+        message (str): Log message
+        module (str): Python module name for the "module" field
+        level (str): Level name for the "level" field (default: INFO)
+        **fields: Extra JSON-serializable fields (e.g. request_id, latency_ms)
+    
+    Example:
+        ```python
+        fast_log("AutoAssist", "cache warmed", "main", entries=256)
+        # {"timestamp":"2026-02-12T10:30:45.123456","level":"INFO","logger":"AutoAssist",
+        #  "message":"cache warmed","module":"main","entries":256}
+        ```
+    """
+    record = {
+        "timestamp": time.time(),  # Formatted on the listener thread
+        "level": level,
+        "logger": logger_name,
+        "message": message,
+        "module": module,
+    }
+    record.update(fields)
+    
+    log_queue = _log_queue
+    if log_queue is not None:
+        log_queue.put_nowait(record)
+        return
+    record["timestamp"] = _fast_log_formatter._format_timestamp(record["timestamp"])
+    line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE).decode()
+    with _fast_log_lock:
+        sys.stdout.write(line)
+
+
 # ============================================================================
 # REQUEST TRACKING AND TIMING
 # ============================================================================
@@ -218,7 +475,7 @@ class RequestTracker:
     and log success/failure with structured data. Useful for API endpoints.
     
     Features:
-        - Automatic request ID generation (UUID v4)
+        - Automatic request ID generation (64-bit random hex)
         - Precise latency measurement in milliseconds
         - Automatic success/error logging
         - Exception propagation (doesn't swallow errors)
@@ -242,23 +499,29 @@ class RequestTracker:
             return {"order_id": order_id, "status": "processed"}
         
         # Logs on success:
-        # {"timestamp": "...", "message": "Request process_order completed",
-        #  "request_id": "abc-123", "latency_ms": 45.67, "status": "success"}
+        # {"timestamp": "...", "level": "INFO", "message": "Request process_order completed",
+        #  "module": "observability", "request_id": "abc-123", "latency_ms": 45.67}
         
-        # Logs on error:
+        # Logs on error (with the traceback):
         # {"timestamp": "...", "message": "Request process_order failed: ...",
-        #  "request_id": "abc-123", "latency_ms": 12.34, "status": "error"}
+        #  "exception": "Traceback ...", "request_id": "abc-123", "latency_ms": 12.34}
         ```
     """
     
-    def __init__(self, logger: logging.Logger):
+    __slots__ = ("logger", "ndjson")
+    
+    def __init__(self, logger: logging.Logger, ndjson: bool = False):
         """
         Initialize request tracker with logger.
         
         Args:
             logger (logging.Logger): Logger instance for writing tracking logs
+            ndjson (bool): Log success records with fast_log() instead of
+                           through the logger (default: False). Failures
+                           always go through the logger.
         """
         self.logger = logger
+        self.ndjson = ndjson
     
     def __call__(self, func: Callable) -> Callable:
         """
@@ -270,48 +533,59 @@ class RequestTracker:
         Returns:
             Callable: Wrapped function with automatic tracking
         """
+        # Built once per decorated function rather than on every call
+        logger = self.logger
+        ndjson = self.ndjson
+        success_message = f"Request {func.__name__} completed"
+        error_message = f"Request {func.__name__} failed: %s"
+        
         @wraps(func)  # Preserves original function metadata (__name__, __doc__, etc.)
         def wrapper(*args, **kwargs):
             # Step 1: Generate unique request ID for distributed tracing
-            request_id = str(uuid.uuid4())
+            # (64 random bits as hex: no urandom syscall or UUID object, and
+            # collisions are negligible at these volumes)
+            request_id = f"{random.getrandbits(64):016x}"
             
             # Step 2: Record start time for latency calculation
-            start_time = time.time()
+            # (monotonic, nanosecond clock: unaffected by NTP adjustments)
+            start_ns = time.perf_counter_ns()
             
+            status = None  # Stays None for BaseException (e.g. KeyboardInterrupt): not logged
             try:
                 # Step 3: Execute the wrapped function
                 result = func(*args, **kwargs)
-                
-                # Step 4: Calculate latency in milliseconds
-                latency_ms = (time.time() - start_time) * 1000
-                
-                # Step 5: Log successful completion with metrics
-                log_record = {
-                    "request_id": request_id,
-                    "latency_ms": latency_ms,
-                    "status": "success"
-                }
-                
-                self.logger.info(
-                    f"Request {func.__name__} completed",
-                    extra=log_record
-                )
-                
+                status = "success"
                 return result
                 
             except Exception as e:
-                # Step 6: Log error with metrics (still calculate latency)
-                latency_ms = (time.time() - start_time) * 1000
-                self.logger.error(
-                    f"Request {func.__name__} failed: {str(e)}",
-                    extra={
+                status, error = "error", e
+                # Re-raise exception (don't swallow errors)
+                raise
+                
+            finally:
+                level = logging.INFO if status == "success" else logging.ERROR
+                if status is not None and logger.isEnabledFor(level):
+                    # Step 4: Calculate latency in milliseconds (once, for either outcome)
+                    latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                    log_record = {
                         "request_id": request_id,
                         "latency_ms": latency_ms,
-                        "status": "error"
+                        "status": status
                     }
-                )
-                # Re-raise exception (don't swallow errors)
-                raise
+                    
+                    # Step 5: Log completion or failure with metrics
+                    if status == "success" and ndjson:
+                        # Same fields the logger path emits (JSONFormatter has no "status")
+                        fast_log(
+                            logger.name, success_message, __name__.rpartition(".")[2],
+                            request_id=request_id, latency_ms=latency_ms,
+                        )
+                    elif status == "success":
+                        logger.info(success_message, extra=log_record)
+                    else:
+                        # Pass the exception itself: this runs in finally, outside
+                        # the except block, so exc_info=True would find nothing
+                        logger.error(error_message, error, exc_info=error, extra=log_record)
         
         return wrapper
 
@@ -319,6 +593,140 @@ class RequestTracker:
 # ============================================================================
 # PROMETHEUS-COMPATIBLE METRICS COLLECTION
 # ============================================================================
+# Slots of MetricsCollector._counts
+_REQUESTS, _ERRORS, _LATENCY_US, _CACHE_HITS = range(4)
+
+# Pending samples folded into the counters inline once this many queue up
+# (bounds memory when nothing reads the metrics for a while)
+_MAX_PENDING_SAMPLES = 4096
+
+# Latency histogram: 8 log-linear sub-buckets per power of two (≤12.5%
+# relative error) over integer microseconds, up to ~2^27 µs (~134s); slower
+# samples land in the last bucket
+_HISTOGRAM_SUB_BUCKET_BITS = 3
+_HISTOGRAM_SUB_BUCKETS = 1 << _HISTOGRAM_SUB_BUCKET_BITS
+_HISTOGRAM_BUCKETS = (27 - _HISTOGRAM_SUB_BUCKET_BITS + 1) * _HISTOGRAM_SUB_BUCKETS
+
+
+class _LatencyHistogram:
+    """
+    Fixed-size log-linear (HDR-style) latency histogram.
+    
+    Each sample is one O(1) increment into a ~1.5 KB bucket array, and any
+    quantile is answered with one pass over the buckets, so memory and
+    query cost stay constant however many requests are recorded.
+    
+    Bucket Layout:
+        Values below 8 µs get one bucket each. Above that, every power of
+        two [2^k, 2^(k+1)) is split into 8 equal-width sub-buckets, so a
+        bucket is never wider than 1/8 of its lower bound.
+    """
+    
+    __slots__ = ("_buckets", "count")
+    
+    def __init__(self):
+        self._buckets = array("Q", bytes(8 * _HISTOGRAM_BUCKETS))
+        self.count = 0
+    
+    @staticmethod
+    def _bucket_index(value_us: int) -> int:
+        """Bucket holding value_us."""
+        if value_us < _HISTOGRAM_SUB_BUCKETS:
+            return max(value_us, 0)
+        shift = value_us.bit_length() - _HISTOGRAM_SUB_BUCKET_BITS - 1
+        index = (shift + 1) * _HISTOGRAM_SUB_BUCKETS + (value_us >> shift) - _HISTOGRAM_SUB_BUCKETS
+        return min(index, _HISTOGRAM_BUCKETS - 1)
+    
+    @staticmethod
+    def _bucket_midpoint(index: int) -> float:
+        """Midpoint of a bucket's value range, in microseconds."""
+        if index < _HISTOGRAM_SUB_BUCKETS:
+            return float(index)
+        shift = index // _HISTOGRAM_SUB_BUCKETS - 1
+        lower = (index % _HISTOGRAM_SUB_BUCKETS + _HISTOGRAM_SUB_BUCKETS) << shift
+        return lower + (1 << shift) / 2
+    
+    def record(self, value_us: int) -> None:
+        """Record one latency sample in microseconds."""
+        self._buckets[self._bucket_index(value_us)] += 1
+        self.count += 1
+    
+    def record_many(self, values_us: tuple) -> None:
+        """
+        Record a batch of latency samples in microseconds.
+        
+        Same bucketing as _bucket_index(), inlined with the constants bound
+        to locals: folding thousands of samples costs one Python-level loop
+        instead of two method calls per sample.
+        """
+        buckets = self._buckets
+        sub_bucket_bits = _HISTOGRAM_SUB_BUCKET_BITS + 1
+        sub_buckets = _HISTOGRAM_SUB_BUCKETS
+        last_bucket = _HISTOGRAM_BUCKETS - 1
+        for value_us in values_us:
+            if value_us < sub_buckets:
+                buckets[value_us if value_us > 0 else 0] += 1
+                continue
+            shift = value_us.bit_length() - sub_bucket_bits
+            index = shift * sub_buckets + (value_us >> shift)
+            buckets[index if index < last_bucket else last_bucket] += 1
+        self.count += len(values_us)
+    
+    def quantile_ms(self, quantile: float) -> float:
+        """
+        Estimate a latency quantile.
+        
+        Args:
+            quantile (float): Quantile to estimate (0.0-1.0), e.g. 0.95 for p95
+        
+        Returns:
+            float: Midpoint of the bucket holding the quantile, in milliseconds
+                   (0.0 if nothing has been recorded)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, round(quantile * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self._buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return self._bucket_midpoint(index) / 1000
+        return self._bucket_midpoint(_HISTOGRAM_BUCKETS - 1) / 1000
+
+# Prometheus exposition text with HELP/TYPE lines baked in; only the values
+# (keys of MetricsCollector.get_metrics()) are filled in per scrape
+_PROMETHEUS_TEMPLATE = (
+    # Metric 1: Total requests (counter)
+    "# HELP autoassist_requests_total Total number of requests\n"
+    "# TYPE autoassist_requests_total counter\n"
+    "autoassist_requests_total {total_requests}\n"
+    # Metric 2: Total errors (counter)
+    "# HELP autoassist_errors_total Total number of errors\n"
+    "# TYPE autoassist_errors_total counter\n"
+    "autoassist_errors_total {total_errors}\n"
+    # Metric 3: Average latency (gauge)
+    "# HELP autoassist_request_latency_ms Average request latency in milliseconds\n"
+    "# TYPE autoassist_request_latency_ms gauge\n"
+    "autoassist_request_latency_ms {avg_latency_ms:.2f}\n"
+    # Metric 4: Success rate (gauge)
+    "# HELP autoassist_success_rate Success rate percentage\n"
+    "# TYPE autoassist_success_rate gauge\n"
+    "autoassist_success_rate {success_rate:.2f}\n"
+    # Metric 5: Cache hits (counter)
+    "# HELP autoassist_cache_hits_total Requests answered from the response cache\n"
+    "# TYPE autoassist_cache_hits_total counter\n"
+    "autoassist_cache_hits_total {cache_hits}\n"
+    # Metric 6: Latency quantiles (summary)
+    "# HELP autoassist_request_duration_ms Request latency in milliseconds\n"
+    "# TYPE autoassist_request_duration_ms summary\n"
+    'autoassist_request_duration_ms{{quantile="0.5"}} {p50_latency_ms:.2f}\n'
+    'autoassist_request_duration_ms{{quantile="0.95"}} {p95_latency_ms:.2f}\n'
+    'autoassist_request_duration_ms{{quantile="0.99"}} {p99_latency_ms:.2f}\n'
+    "autoassist_request_duration_ms_sum {total_latency_ms:.2f}\n"
+    "autoassist_request_duration_ms_count {total_requests}\n"
+)
+
+
 class MetricsCollector:
     """
     Metrics Collector with Prometheus-Compatible Output
@@ -330,11 +738,35 @@ class MetricsCollector:
         - request_count: Total number of requests processed (counter)
         - error_count: Total number of failed requests (counter)
         - total_latency: Cumulative latency across all requests (internal)
-        - request_latencies: List of individual request latencies (for future percentile calculations)
+        - cache_hit_count: Requests served from the response cache (counter)
+        - latency_histogram: Log-linear histogram of all request latencies (fixed size,
+          for p50/p95/p99; memory stays bounded on long-running services)
+    
+    Storage:
+        The counters live in one unsigned 64-bit array (latency as
+        integer microseconds). The names above are read-only properties
+        over that array.
+    
+    Deferred Accounting:
+        Recording a request only appends a (latency, error, cached) tuple
+        to a pending deque - a single C-level append on the request path.
+        The accounting is done by whoever reads the metrics (scrapes,
+        properties), which folds all pending samples into the counters in
+        one pass; the request path folds only when the pending deque hits
+        _MAX_PENDING_SAMPLES.
+    
+    Thread Safety:
+        Safe to call from any thread without locking the write path:
+        samples go into a deque, whose append() and popleft() are atomic,
+        so no sample is lost while another thread folds. Folding and
+        snapshot reads are serialized by a lock, which only readers (and
+        the occasional threshold fold) ever take.
     
     Derived Metrics:
         - avg_latency_ms: Average request latency in milliseconds
         - success_rate: Percentage of successful requests (0-100)
+        - cache_hit_rate: Percentage of requests served from the cache (0-100)
+        - p50/p95/p99_latency_ms: Latency quantiles (within 12.5%) from the histogram
     
     Prometheus Integration:
         - Metrics exposed via /metrics/prometheus endpoint
@@ -343,13 +775,11 @@ class MetricsCollector:
     
     Limitations:
         - Metrics stored in-memory (reset on application restart)
-        - No histogram or percentile support (p50, p95, p99)
         - Single-instance only (no distributed metrics aggregation)
     
     Production Considerations:
         - For production, consider using official prometheus_client library
         - For distributed systems, use external metrics storage (Redis, InfluxDB)
-        - For percentiles, implement histogram buckets or use summary metrics
     
     Example:
         ```python
@@ -371,30 +801,99 @@ class MetricsCollector:
         ```
     """
     
+    # No per-instance __dict__: attribute access is a fixed-offset slot read
+    __slots__ = ("_counts", "_pending", "_fold_lock", "latency_histogram")
+    
     def __init__(self):
         """
         Initialize metrics collector with zero values.
         
         All metrics start at zero and increment as requests are processed.
         """
-        self.request_count = 0        # Total requests processed
-        self.error_count = 0          # Total errors encountered
-        self.total_latency = 0.0      # Cumulative latency (for average calculation)
-        self.request_latencies = []   # Individual latencies (for future percentile support)
+        # [requests processed, errors encountered, cumulative latency in µs, cache hits]
+        self._counts = array("Q", [0, 0, 0, 0])
+        self._pending = deque()       # (latency_us, error, cached) samples not yet counted
+        self._fold_lock = threading.RLock()  # Serializes folds and snapshot reads
+        # Latency distribution for percentiles (fixed memory, O(1) per sample)
+        self.latency_histogram = _LatencyHistogram()
+    
+    def _fold(self):
+        """Fold pending samples into the counters."""
+        with self._fold_lock:
+            pending = self._pending
+            # Drain only what is queued now; samples appended meanwhile by
+            # other threads stay queued for the next fold
+            folded = len(pending)
+            if not folded:
+                return
+            
+            popleft = pending.popleft
+            samples = [popleft() for _ in range(folded)]
+            
+            # Transpose to per-field columns so the sums run in C
+            latencies_us, errors, cached = zip(*samples)
+            self.latency_histogram.record_many(latencies_us)
+            
+            counts = self._counts
+            counts[_REQUESTS] += folded
+            counts[_ERRORS] += sum(errors)
+            counts[_LATENCY_US] += sum(latencies_us)
+            counts[_CACHE_HITS] += sum(cached)
+    
+    @property
+    def request_count(self) -> int:
+        """Total requests processed."""
+        self._fold()
+        return self._counts[_REQUESTS]
+    
+    @property
+    def error_count(self) -> int:
+        """Total errors encountered."""
+        self._fold()
+        return self._counts[_ERRORS]
+    
+    @property
+    def total_latency(self) -> float:
+        """Cumulative latency in milliseconds (for average calculation)."""
+        self._fold()
+        return self._counts[_LATENCY_US] / 1000
+    
+    @property
+    def cache_hit_count(self) -> int:
+        """Requests served from the response cache."""
+        self._fold()
+        return self._counts[_CACHE_HITS]
+    
+    def snapshot(self) -> tuple:
+        """
+        Read all counters at once.
+        
+        Reading the properties one by one can interleave with recording
+        threads (e.g. error_count briefly ahead of request_count). This
+        folds pending samples and copies the counters under the fold lock,
+        so the values are mutually consistent.
+        
+        Returns:
+            tuple: (request_count, error_count, total_latency_us, cache_hit_count)
+        """
+        with self._fold_lock:
+            self._fold()
+            return tuple(self._counts)
     
     def record_request(self, latency_ms: float, error: bool = False):
         """
         Record a request metric.
         
         Call this method after each request completes to track metrics.
+        Callers that time with time.perf_counter_ns() should prefer
+        record_request_us(), which skips the float conversion.
         
         Args:
             latency_ms (float): Request processing time in milliseconds
             error (bool): Whether the request failed (default: False)
         
         Thread Safety:
-            This implementation is NOT thread-safe. For production use with
-            multiple workers, consider using atomic operations or locks.
+            Safe to call concurrently from multiple threads (see class docs).
         
         Example:
             ```python
@@ -408,49 +907,99 @@ class MetricsCollector:
                 metrics.record_request(latency_ms=latency, error=True)
             ```
         """
-        # Increment total request counter
-        self.request_count += 1
+        self.record_request_us(int(latency_ms * 1000), error)
+    
+    def record_request_us(self, latency_us: int, error: bool = False, cached: bool = False):
+        """
+        Record a request metric with latency in integer microseconds.
         
-        # Add latency to cumulative total (for average calculation)
-        self.total_latency += latency_ms
+        Integer fast path of record_request(): latency stays an int from
+        time.perf_counter_ns() to the counters, and is only converted to
+        milliseconds when metrics are read.
         
-        # Store individual latency (for future percentile calculations)
-        self.request_latencies.append(latency_ms)
+        Args:
+            latency_us (int): Request processing time in microseconds
+            error (bool): Whether the request failed (default: False)
+            cached (bool): Whether the response came from the cache (default: False)
         
-        # Increment error counter if request failed
-        if error:
-            self.error_count += 1
+        Example:
+            ```python
+            start_ns = time.perf_counter_ns()
+            process_request()
+            metrics.record_request_us((time.perf_counter_ns() - start_ns) // 1000)
+            ```
+        """
+        # Queue the sample; counters are updated when metrics are read
+        pending = self._pending
+        pending.append((latency_us, error, cached))
+        if len(pending) >= _MAX_PENDING_SAMPLES:
+            self._fold()
     
-    def get_metrics(self) -> dict:
+    def get_metrics(self, rounded: bool = True) -> dict:
         """
         Get current metrics snapshot as dictionary.
         
+        Args:
+            rounded (bool): Round float metrics to 2 decimal places (default:
+                            True). The Prometheus exporter passes False and
+                            applies the precision while formatting instead.
+        
         Returns:
             dict: Metrics snapshot with keys:
                 - total_requests (int): Total requests processed
                 - total_errors (int): Total errors encountered
                 - avg_latency_ms (float): Average latency in milliseconds
                 - success_rate (float): Success rate percentage (0-100)
+                - cache_hits (int): Requests served from the response cache
+                - cache_hit_rate (float): Cache hit percentage (0-100)
+                - total_latency_ms (float): Cumulative latency in milliseconds
+                - p50_latency_ms, p95_latency_ms, p99_latency_ms (float): Latency
+                  quantiles in milliseconds, from the latency histogram
         
         Calculations:
             - avg_latency_ms = total_latency / max(request_count, 1)
             - success_rate = ((request_count - error_count) / request_count) * 100
+            - cache_hit_rate = (cache_hit_count / request_count) * 100
         
         Edge Cases:
             - If no requests processed, avg_latency_ms = 0.0, success_rate = 0.0
             - Division by zero prevented using max(request_count, 1)
         """
+        # Count pending samples, then read all counters once under the fold
+        # lock so the snapshot is internally consistent
+        with self._fold_lock:
+            request_count, error_count, total_latency_us, cache_hits = self.snapshot()
+            histogram = self.latency_histogram
+            p50, p95, p99 = (histogram.quantile_ms(q) for q in (0.5, 0.95, 0.99))
+        
         # Calculate average latency (avoid division by zero)
-        avg_latency = self.total_latency / max(self.request_count, 1)
+        avg_latency = total_latency_us / 1000 / max(request_count, 1)
         
         # Calculate success rate as percentage (0-100)
-        success_rate = ((self.request_count - self.error_count) / max(self.request_count, 1)) * 100 if self.request_count > 0 else 0
+        success_rate = ((request_count - error_count) / request_count) * 100 if request_count > 0 else 0
+        
+        # Calculate cache hit rate as percentage (0-100)
+        cache_hit_rate = (cache_hits / request_count) * 100 if request_count > 0 else 0
+        
+        total_latency_ms = total_latency_us / 1000
+        if rounded:
+            # Round to 2 decimal places
+            avg_latency, success_rate, cache_hit_rate, total_latency_ms, p50, p95, p99 = (
+                round(value, 2)
+                for value in (avg_latency, success_rate, cache_hit_rate, total_latency_ms, p50, p95, p99)
+            )
         
         return {
-            "total_requests": self.request_count,
-            "total_errors": self.error_count,
-            "avg_latency_ms": round(avg_latency, 2),  # Round to 2 decimal places
-            "success_rate": round(success_rate, 2),   # Round to 2 decimal places
+            "total_requests": request_count,
+            "total_errors": error_count,
+            "avg_latency_ms": avg_latency,
+            "success_rate": success_rate,
+            "cache_hits": cache_hits,
+            "cache_hit_rate": cache_hit_rate,
+            "total_latency_ms": total_latency_ms,
+            "p50_latency_ms": p50,
+            "p95_latency_ms": p95,
+            "p99_latency_ms": p99,
         }
     
     def get_prometheus_format(self) -> str:
@@ -492,34 +1041,9 @@ class MetricsCollector:
             This format is scraped by Prometheus via /metrics/prometheus endpoint.
             Prometheus stores time-series data and Grafana visualizes it.
         """
-        # Get current metrics snapshot
-        metrics = self.get_metrics()
-        
-        # Build Prometheus text format output
-        output = []
-        
-        # Metric 1: Total requests (counter)
-        output.append("# HELP autoassist_requests_total Total number of requests")
-        output.append("# TYPE autoassist_requests_total counter")
-        output.append(f"autoassist_requests_total {metrics['total_requests']}")
-        
-        # Metric 2: Total errors (counter)
-        output.append("# HELP autoassist_errors_total Total number of errors")
-        output.append("# TYPE autoassist_errors_total counter")
-        output.append(f"autoassist_errors_total {metrics['total_errors']}")
-        
-        # Metric 3: Average latency (gauge)
-        output.append("# HELP autoassist_request_latency_ms Average request latency in milliseconds")
-        output.append("# TYPE autoassist_request_latency_ms gauge")
-        output.append(f"autoassist_request_latency_ms {metrics['avg_latency_ms']}")
-        
-        # Metric 4: Success rate (gauge)
-        output.append("# HELP autoassist_success_rate Success rate percentage")
-        output.append("# TYPE autoassist_success_rate gauge")
-        output.append(f"autoassist_success_rate {metrics['success_rate']}")
-        
-        # Join with newlines (Prometheus expects line-delimited format)
-        return "\n".join(output)
+        # Fill the current (unrounded) snapshot into the pre-built exposition
+        # text; the template's format specs apply the 2-decimal precision
+        return _PROMETHEUS_TEMPLATE.format_map(self.get_metrics(rounded=False))
 
 
 # ============================================================================
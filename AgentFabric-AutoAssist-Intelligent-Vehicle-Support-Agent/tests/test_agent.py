@@ -0,0 +1,310 @@
+"""
+Tests for the agent (app/agent.py): guardrail pre-filter and follow-up prefetch
+"""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import httpx
+
+from app.agent import AutoAssistAgent, _OFF_TOPIC_REFUSAL, _PROMPT_PREFIX
+from app.config import AppConfig, LLMConfig
+from app.llm_adapter import LLMAdapter
+
+
+def _make_agent(llm_settings=None, **app_settings) -> AutoAssistAgent:
+    return AutoAssistAgent(
+        AppConfig(
+            llm=LLMConfig(
+                provider="local",
+                model_name="test-model",
+                api_endpoint="http://llm.test/v1",
+                **(llm_settings or {}),
+            ),
+            **app_settings,
+        )
+    )
+
+
+# Vehicle-safety questions that mention medical words
+VEHICLE_SAFETY_QUERIES = (
+    "How should I wear the seat belt when pregnant?",
+    "Should I turn off the passenger airbag during pregnancy?",
+    "My seat belt gives me chest pain after braking hard, is it adjusted wrong?",
+    "Can I drive after taking my prescription medication?",
+)
+
+OFF_TOPIC_QUERIES = (
+    "What is the stock price of Tesla today?",
+    "Should I buy bitcoin?",
+    "Can you diagnose my rash?",
+    "What should my blood pressure be?",
+)
+
+
+class OffTopicFilterTest(unittest.TestCase):
+    def test_vehicle_safety_questions_are_not_refused(self):
+        for query in VEHICLE_SAFETY_QUERIES:
+            with self.subTest(query=query):
+                self.assertFalse(AutoAssistAgent.is_off_topic(query))
+
+    def test_off_topic_questions_are_refused(self):
+        for query in OFF_TOPIC_QUERIES:
+            with self.subTest(query=query):
+                self.assertTrue(AutoAssistAgent.is_off_topic(query))
+
+
+class ProcessQueryGuardrailTest(unittest.IsolatedAsyncioTestCase):
+    async def test_vehicle_safety_question_reaches_llm(self):
+        agent = _make_agent()
+        with mock.patch.object(AutoAssistAgent, "_call_llm", mock.AsyncMock(return_value="Wear the lap belt low.")):
+            result = await agent.process_query(VEHICLE_SAFETY_QUERIES[0])
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["response"], "Wear the lap belt low.")
+
+    async def test_off_topic_question_skips_llm(self):
+        agent = _make_agent()
+        call_llm = mock.AsyncMock()
+        with mock.patch.object(AutoAssistAgent, "_call_llm", call_llm):
+            result = await agent.process_query(OFF_TOPIC_QUERIES[0])
+        self.assertEqual(result["response"], _OFF_TOPIC_REFUSAL)
+        call_llm.assert_not_called()
+
+
+class ProcessQueriesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_single_query_chunk_is_looked_up_once(self):
+        agent = _make_agent()
+        with mock.patch.object(AutoAssistAgent, "_call_llm", mock.AsyncMock(return_value="Use a gauge.")):
+            results = await agent.process_queries(["How do I check my tire pressure?"])
+        self.assertEqual(results[0]["response"], "Use a gauge.")
+        self.assertEqual((agent.response_cache.hits, agent.response_cache.misses), (0, 1))
+
+    async def test_unparseable_bulk_answer_falls_back_per_query(self):
+        agent = _make_agent()
+        queries = ["How do I check my tire pressure?", "How do I check my oil?"]
+        call_llm = mock.AsyncMock(side_effect=["not json", "Use a gauge.", "Pull the dipstick."])
+        with mock.patch.object(AutoAssistAgent, "_call_llm", call_llm):
+            results = await agent.process_queries(queries)
+        self.assertEqual([r["response"] for r in results], ["Use a gauge.", "Pull the dipstick."])
+        self.assertEqual(agent.response_cache.misses, 2)
+
+
+class FollowupPrefetchTest(unittest.IsolatedAsyncioTestCase):
+    QUERY = "How do I replace my cabin air filter?"
+
+    async def asyncSetUp(self):
+        self.agent = _make_agent(prefetch_followups=True)
+
+        async def call_llm(prompt):
+            if "How often" in prompt:
+                return "Every 15,000 miles."
+            if "tools or parts" in prompt:
+                return "A new filter and a screwdriver."
+            return "Open the glovebox..."
+
+        patcher = mock.patch.object(AutoAssistAgent, "_call_llm", side_effect=call_llm)
+        self.call_llm = patcher.start()
+        self.addCleanup(patcher.stop)
+        await self.agent.process_query(self.QUERY, session_id="s1")
+        await asyncio.gather(*self.agent._prefetch_tasks)
+
+    async def test_followup_turn_is_served_from_prefetch(self):
+        calls = self.call_llm.call_count
+        for followup, answer in (
+            ("How often should I do this?", "Every 15,000 miles."),
+            ("how often?", "Every 15,000 miles."),
+            ("What tools do I need?", "A new filter and a screwdriver."),
+        ):
+            with self.subTest(followup=followup):
+                result = await self.agent.process_query(followup, session_id="s1")
+                self.assertEqual(result["response"], answer)
+                self.assertTrue(result["cached"])
+        self.assertEqual(self.call_llm.call_count, calls)
+
+    async def test_prefetch_prompt_carries_the_original_question(self):
+        prompts = [call.args[0] for call in self.call_llm.call_args_list[1:]]
+        self.assertEqual(len(prompts), 2)
+        for prompt in prompts:
+            self.assertIn(self.QUERY, prompt)
+
+    async def test_other_sessions_do_not_get_the_followups(self):
+        calls = self.call_llm.call_count
+        result = await self.agent.process_query("How often should I do this?", session_id="s2")
+        self.assertFalse(result["cached"])
+        self.assertEqual(self.call_llm.call_count, calls + 1)
+
+    async def test_new_question_replaces_the_sessions_followups(self):
+        await self.agent.process_query("How do I rotate my tires?", session_id="s1")
+        # Old answers are gone at once, before the new prefetch finishes
+        self.assertEqual(self.agent._followups["s1"][0], {})
+        await asyncio.gather(*self.agent._prefetch_tasks)
+        self.assertIn("rotate my tires", self.call_llm.call_args_list[-1].args[0])
+
+    async def test_aclose_waits_for_cancelled_prefetches(self):
+        started = asyncio.Event()
+
+        async def slow_llm(prompt):
+            started.set()
+            await asyncio.sleep(10)
+
+        self.call_llm.side_effect = slow_llm
+        self.agent._start_prefetch(self.QUERY, "s3")
+        await started.wait()
+        tasks = list(self.agent._prefetch_tasks)
+        await self.agent.aclose()
+        self.assertTrue(all(task.done() for task in tasks))
+
+    async def test_no_prefetch_without_session(self):
+        calls = self.call_llm.call_count
+        await self.agent.process_query("How do I check my brake fluid?")
+        self.assertFalse(self.agent._prefetch_tasks)
+        self.assertEqual(self.call_llm.call_count, calls + 1)
+
+
+class PretokenizeTest(unittest.IsolatedAsyncioTestCase):
+    QUERY = "How do I check my tire pressure?"
+
+    def _make_agent(self, tokenize):
+        agent = _make_agent(llm_settings={"pretokenize_prompt": True})
+        patcher = mock.patch.object(agent.llm_adapter, "tokenize", tokenize)
+        self.tokenize = patcher.start()
+        self.addCleanup(patcher.stop)
+        return agent
+
+    async def test_concurrent_first_requests_tokenize_once(self):
+        async def tokenize(text):
+            await asyncio.sleep(0.01)
+            return [1, 2, 3]
+
+        agent = self._make_agent(mock.AsyncMock(side_effect=tokenize))
+        prompts = await asyncio.gather(*(agent._build_prompt(self.QUERY) for _ in range(5)))
+        self.assertEqual(self.tokenize.await_count, 1)
+        for prompt in prompts:
+            self.assertEqual(prompt[:3], [1, 2, 3])
+
+    async def test_failure_falls_back_then_retries_after_backoff(self):
+        agent = self._make_agent(mock.AsyncMock(side_effect=[RuntimeError("tokenize down"), [1, 2, 3]]))
+        self.assertEqual(await agent._build_prompt(self.QUERY), agent.construct_prompt(self.QUERY))
+        # Still backing off: no second tokenize call
+        self.assertEqual(await agent._build_prompt(self.QUERY), agent.construct_prompt(self.QUERY))
+        self.assertEqual(self.tokenize.await_count, 1)
+
+        agent._tokenize_retry_at = 0.0  # Backoff elapsed
+        self.assertEqual((await agent._build_prompt(self.QUERY))[:3], [1, 2, 3])
+        self.assertEqual(self.tokenize.await_count, 2)
+
+    async def test_followup_prefetch_uses_tokenized_prompt(self):
+        agent = self._make_agent(mock.AsyncMock(return_value=[1, 2, 3]))
+        call_llm = mock.AsyncMock(return_value="answer")
+        with mock.patch.object(AutoAssistAgent, "_call_llm", call_llm):
+            await agent._prefetch_followups(self.QUERY, {})
+        self.assertTrue(call_llm.await_args_list)
+        for call in call_llm.await_args_list:
+            self.assertEqual(call.args[0][:3], [1, 2, 3])
+
+
+class StreamingTest(unittest.IsolatedAsyncioTestCase):
+    QUERY = "How do I check my tire pressure?"
+
+    def _patch_stream(self, agent, *chunks, delay=0.0):
+        async def generate_stream(prompt):
+            for chunk in chunks:
+                await asyncio.sleep(delay)
+                yield chunk
+
+        patcher = mock.patch.object(agent.llm_adapter, "generate_stream", generate_stream)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_slow_reader_does_not_hold_the_concurrency_slot(self):
+        agent = _make_agent()
+        self._patch_stream(agent, "Check ", "when cold.")
+        stream = agent.process_query_stream(self.QUERY)
+        self.assertEqual(await anext(stream), "Check ")
+        # Client stops reading; generation finishes and frees the slot anyway
+        await asyncio.sleep(0.01)
+        self.assertEqual(agent._inflight._value, agent.config.llm.max_concurrency)
+        self.assertEqual([chunk async for chunk in stream], ["when cold."])
+        self.assertEqual(agent.response_cache.get(self.QUERY), "Check when cold.")
+
+    async def test_first_chunk_timeout(self):
+        agent = _make_agent(llm_settings={"timeout_seconds": 0.01})
+        self._patch_stream(agent, "late", delay=1.0)
+        with self.assertRaises(asyncio.TimeoutError):
+            await anext(agent.process_query_stream(self.QUERY))
+        await asyncio.sleep(0)
+        self.assertEqual(agent._inflight._value, agent.config.llm.max_concurrency)
+
+    async def test_overall_timeout(self):
+        agent = _make_agent(request_timeout_seconds=0.05)
+        self._patch_stream(agent, *["chunk"] * 10, delay=0.02)
+        stream = agent.process_query_stream(self.QUERY)
+        self.assertEqual(await anext(stream), "chunk")
+        with self.assertRaises(TimeoutError):
+            async for _ in stream:
+                pass
+        self.assertIsNone(agent.response_cache.get(self.QUERY))
+
+
+class AnthropicProviderTest(unittest.IsolatedAsyncioTestCase):
+    """PROVIDER_FAMILY=anthropic end to end, against a mock /v1/messages endpoint."""
+
+    QUERY = "How do I check my tire pressure?"
+    ENDPOINT = "https://api.anthropic.test/v1/messages"
+
+    async def asyncSetUp(self):
+        self.agent = AutoAssistAgent(
+            AppConfig(
+                llm=LLMConfig(
+                    provider="api",
+                    model_name="claude-test",
+                    api_endpoint=self.ENDPOINT,
+                    api_token="test-key",
+                    provider_family="anthropic",
+                )
+            )
+        )
+        self.requests = []
+        adapter = self.agent.llm_adapter
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self._handle), headers=adapter._headers)
+        LLMAdapter._CLIENTS[adapter._client_key] = client
+        self.addAsyncCleanup(LLMAdapter.aclose_clients)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append((request, body))
+        if "prompt" in body or "messages" not in body:
+            return httpx.Response(400, json={"error": {"type": "invalid_request_error"}})
+        if body.get("stream"):
+            events = [
+                {"type": "message_start", "message": {}},
+                {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Use a "}},
+                {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "gauge."}},
+                {"type": "message_stop"},
+            ]
+            sse = "".join(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events)
+            return httpx.Response(200, text=sse, headers={"content-type": "text/event-stream"})
+        return httpx.Response(200, json={"content": [{"type": "text", "text": "Use a gauge."}]})
+
+    async def test_process_query_sends_cacheable_system_prompt(self):
+        result = await self.agent.process_query(self.QUERY)
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["response"], "Use a gauge.")
+
+        request, body = self.requests[-1]
+        self.assertEqual(str(request.url), self.ENDPOINT)
+        self.assertEqual(request.headers["x-api-key"], "test-key")
+        self.assertEqual(body["system"][0]["text"], _PROMPT_PREFIX)
+        self.assertEqual(body["system"][0]["cache_control"], {"type": "ephemeral"})
+        self.assertTrue(body["messages"][0]["content"].startswith(self.QUERY))
+
+    async def test_process_query_stream_uses_messages_api(self):
+        chunks = [chunk async for chunk in self.agent.process_query_stream(self.QUERY)]
+        self.assertEqual("".join(chunks), "Use a gauge.")
+        self.assertIn("messages", self.requests[-1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
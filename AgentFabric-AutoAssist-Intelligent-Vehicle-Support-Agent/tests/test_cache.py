@@ -0,0 +1,101 @@
+"""
+Tests for the response cache (app/cache.py)
+"""
+
+import importlib.util
+import unittest
+from unittest import mock
+
+from app.cache import SemanticCache, normalize_query
+
+
+class NormalizeQueryTest(unittest.TestCase):
+    def test_folds_case_punctuation_and_spacing(self):
+        self.assertEqual(normalize_query("What is  Tire Pressure?"), "what is tire pressure")
+
+    def test_keeps_word_order(self):
+        self.assertNotEqual(
+            normalize_query("5W-30 instead of 10W-40"),
+            normalize_query("10W-40 instead of 5W-30"),
+        )
+
+
+class ExactMatchCacheTest(unittest.TestCase):
+    """Default cache (no embedding model): only normalised repeats hit."""
+
+    def setUp(self):
+        self.cache = SemanticCache(max_entries=8)
+
+    def test_normalised_repeat_hits(self):
+        self.cache.put("How do I check my oil?", "Pull the dipstick...")
+        self.assertEqual(self.cache.get("how do I check my OIL"), "Pull the dipstick...")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_swapped_oil_grades_miss(self):
+        self.cache.put("Should I use 5W-30 instead of 10W-40 oil?", "answer A")
+        self.assertIsNone(self.cache.get("Should I use 10W-40 instead of 5W-30 oil?"))
+
+    def test_cold_and_hot_start_miss(self):
+        self.cache.put("Why is my car hard to start when the engine is cold?", "cold answer")
+        self.assertIsNone(self.cache.get("Why is my car hard to start when the engine is hot?"))
+
+    def test_different_warning_light_misses(self):
+        self.cache.put(
+            "Is it safe to drive with the brake warning light on for a long trip on the highway?",
+            "brake answer",
+        )
+        self.assertIsNone(
+            self.cache.get("Is it safe to drive with the oil warning light on for a long trip on the highway?")
+        )
+
+    def test_evicts_oldest_entry(self):
+        cache = SemanticCache(max_entries=2)
+        cache.put("first", "1")
+        cache.put("second", "2")
+        cache.put("third", "3")
+        self.assertIsNone(cache.get("first"))
+        self.assertEqual(cache.get("third"), "3")
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_miss(self):
+        cache = SemanticCache(max_entries=8, ttl_seconds=10)
+        with mock.patch("app.cache.time.monotonic", return_value=100.0):
+            cache.put("tire pressure", "35 psi")
+        with mock.patch("app.cache.time.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("tire pressure"), "35 psi")
+        with mock.patch("app.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("tire pressure"))
+        self.assertEqual(len(cache), 0)
+
+    def test_zero_entries_disables_cache(self):
+        cache = SemanticCache(max_entries=0)
+        cache.put("tire pressure", "35 psi")
+        self.assertIsNone(cache.get("tire pressure"))
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+class EmbeddingCacheTest(unittest.TestCase):
+    """Opt-in fuzzy matching with an embedding model."""
+
+    def setUp(self):
+        import numpy
+
+        vectors = {
+            "how do i check my oil": [1.0, 0.0],
+            "what is the way to check engine oil": [0.96, 0.28],
+            "what tire pressure should i use": [0.0, 1.0],
+        }
+        embedder = lambda query: numpy.array(vectors[normalize_query(query)])
+        self.cache = SemanticCache(max_entries=8, threshold=0.92, embedder=embedder)
+
+    def test_similar_query_hits(self):
+        self.cache.put("How do I check my oil?", "Pull the dipstick...")
+        self.assertEqual(self.cache.get("What is the way to check engine oil?"), "Pull the dipstick...")
+
+    def test_dissimilar_query_misses(self):
+        self.cache.put("How do I check my oil?", "Pull the dipstick...")
+        self.assertIsNone(self.cache.get("What tire pressure should I use?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests for the LLM adapters (app/llm_adapter.py): micro-batching and the response cache
+"""
+
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from app.config import LLMConfig
+from app.llm_adapter import LLMAdapter, LLMAdapterFactory
+
+
+class SubmitCacheTest(unittest.IsolatedAsyncioTestCase):
+    """submit() with batching on uses the temperature-0 cache like generate()."""
+
+    async def asyncSetUp(self):
+        self.adapter = LLMAdapterFactory.create_adapter(
+            LLMConfig(
+                provider="local",
+                model_name="test-model",
+                api_endpoint="http://llm.test/v1",
+                temperature=0.0,
+                max_batch_size=4,
+                batch_wait_ms=5,
+            )
+        )
+        self.requests = []
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self._handle))
+        LLMAdapter._CLIENTS[self.adapter._client_key] = client
+        self.addAsyncCleanup(LLMAdapter.aclose_clients)
+        self.addAsyncCleanup(self.adapter.aclose)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        prompts = json.loads(request.content)["prompt"]
+        self.requests.append(prompts)
+        return httpx.Response(
+            200,
+            json={"choices": [{"index": i, "text": f"answer {i}"} for i in range(len(prompts))]},
+        )
+
+    async def test_batched_results_are_cached(self):
+        first = await asyncio.gather(self.adapter.submit("a"), self.adapter.submit("b"))
+        self.assertEqual(first, ["answer 0", "answer 1"])
+        self.assertEqual(len(self.requests), 1)
+
+        self.assertEqual(await self.adapter.submit("b"), "answer 1")
+        self.assertEqual(await self.adapter.generate("a"), "answer 0")
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_generate_results_are_served_to_submit(self):
+        await self.adapter.generate("a")
+        self.assertEqual(await self.adapter.submit("a"), "answer 0")
+        self.assertEqual(len(self.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
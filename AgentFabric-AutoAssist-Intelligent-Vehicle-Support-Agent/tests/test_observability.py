@@ -0,0 +1,45 @@
+"""
+Tests for structured logging (app/observability.py): fast_log() vs the logging pipeline
+"""
+
+import io
+import json
+import time
+import unittest
+from unittest import mock
+
+from app import observability
+
+
+class FastLogTest(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        with mock.patch.object(observability.sys, "stdout", self.stream):
+            self.logger = observability.setup_logging(app_name=f"FastLogTest.{self.id()}", log_level="INFO")
+        self.addCleanup(setattr, observability, "_log_queue", None)
+
+    def _lines(self, expected: int) -> list:
+        deadline = time.monotonic() + 2
+        while self.stream.getvalue().count("\n") < expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_same_schema_as_logging_records(self):
+        self.logger.info("via logging", extra={"request_id": "abc", "latency_ms": 1.5})
+        observability.fast_log(self.logger.name, "via fast_log", "test_observability", request_id="abc", latency_ms=1.5)
+        logged, fast = self._lines(2)
+        self.assertEqual(list(fast), list(logged))
+        self.assertEqual(fast["level"], "INFO")
+        self.assertEqual(len(fast["timestamp"]), len(logged["timestamp"]))
+
+    def test_written_in_call_order(self):
+        for i in range(50):
+            if i % 2:
+                observability.fast_log(self.logger.name, str(i), "test_observability")
+            else:
+                self.logger.info(str(i))
+        self.assertEqual([line["message"] for line in self._lines(50)], [str(i) for i in range(50)])
+
+
+if __name__ == "__main__":
+    unittest.main()